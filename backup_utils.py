@@ -1,45 +1,86 @@
 import os
-import shutil
 import datetime
+import heapq
 import sqlite3
 import logging
+import re
+import time
 import traceback
 
 # Configure logger with a NullHandler by default
 logger = logging.getLogger('budget_app.backup')
 logger.addHandler(logging.NullHandler())
 
+# Number of pages copied per sqlite3_backup_step call (-1 copies everything in one step)
+BACKUP_PAGES_PER_STEP = -1
+
+# Pages per step when reporting progress, large enough to keep per-step overhead low
+BACKUP_PROGRESS_PAGES_PER_STEP = 1024
+
+# Seconds a connection waits on a locked database before raising
+SQLITE_TIMEOUT = 30.0
+
+# Attempts and initial delay (seconds, doubled per retry) when a copy hits a lock
+BACKUP_RETRY_ATTEMPTS = 3
+BACKUP_RETRY_DELAY = 0.5
+
+# Backup filenames as written by create_backup: budget_backup_YYYYMMDD_HHMMSS.db
+BACKUP_FILENAME_RE = re.compile(r'^budget_backup_(\d{8}_\d{6})\.db$')
+
+# Magic string at the start of every SQLite 3 database file
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+# Connection-level PRAGMAs applied to a fresh backup file before copying into it
+BACKUP_DEST_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+)
+
 class BackupManager:
     """Utility class for database backups"""
     
-    def __init__(self, db_path='budget.db', backup_dir='backups'):
+    def __init__(self, db_path='budget.db', backup_dir='backups', list_cache_ttl=5.0):
         """
         Initialize the backup manager
         
         Args:
             db_path: Path to the database file
             backup_dir: Directory to store backups
+            list_cache_ttl: Seconds a backup listing is reused before rescanning
         """
         self.db_path = db_path
         self.backup_dir = backup_dir
         
+        # Whether the live database has already been switched to WAL mode
+        self._wal_checked = False
+        
+        # Cached result of the last backup directory scan
+        self._list_ttl = list_cache_ttl
+        self._list_cache = None
+        self._list_cache_ts = 0.0
+        
         # Create backup directory if it doesn't exist
         try:
             if not os.path.exists(backup_dir):
                 os.makedirs(backup_dir)
-                logger.info(f"Created backup directory: {backup_dir}")
+                logger.info("Created backup directory: %s", backup_dir)
             
             # Validate database path exists
             if not os.path.exists(db_path) and db_path != ':memory:':
-                logger.warning(f"Database file not found at initialization: {db_path}")
+                logger.warning("Database file not found at initialization: %s", db_path)
         except Exception as e:
-            logger.error(f"Error during backup manager initialization: {str(e)}")
-            logger.debug(traceback.format_exc())
+            logger.error("Error during backup manager initialization: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
     
-    def create_backup(self):
+    def create_backup(self, progress_callback=None):
         """
         Create a backup of the database
         
+        Args:
+            progress_callback: Optional callable(status, remaining, total) invoked
+                after each batch of pages is copied
+        
         Returns:
             Path to the backup file if successful, None otherwise
         """
@@ -48,7 +89,7 @@ class BackupManager:
         try:
             # Validate database file exists
             if not os.path.exists(self.db_path) and self.db_path != ':memory:':
-                logger.error(f"Database file not found: {self.db_path}")
+                logger.error("Database file not found: %s", self.db_path)
                 return None
                 
             # Create a backup filename with timestamp
@@ -59,28 +100,34 @@ class BackupManager:
             # Ensure backup directory exists
             if not os.path.exists(self.backup_dir):
                 os.makedirs(self.backup_dir)
-                logger.info(f"Created backup directory: {self.backup_dir}")
+                logger.info("Created backup directory: %s", self.backup_dir)
             
             # Use SQLite's backup API for a consistent backup
-            logger.debug(f"Opening source database: {self.db_path}")
-            source = sqlite3.connect(self.db_path)
+            logger.debug("Opening source database: %s", self.db_path)
+            source = sqlite3.connect(self.db_path, timeout=SQLITE_TIMEOUT, isolation_level=None)
+            self._ensure_wal(source)
             
-            logger.debug(f"Creating destination database: {backup_path}")
-            dest = sqlite3.connect(backup_path)
+            logger.debug("Creating destination database: %s", backup_path)
+            dest = sqlite3.connect(backup_path, timeout=SQLITE_TIMEOUT)
+            for pragma in BACKUP_DEST_PRAGMAS:
+                dest.execute(pragma)
             
             logger.debug("Starting database backup process")
-            source.backup(dest)
+            self._copy_database(source, dest, progress_callback)
             
-            logger.info(f"Database backup successfully created: {backup_path}")
+            self._invalidate_list_cache()
+            logger.info("Database backup successfully created: %s", backup_path)
             return backup_path
             
         except sqlite3.Error as sql_e:
-            logger.error(f"SQLite error during backup creation: {sql_e}")
-            logger.debug(traceback.format_exc())
+            logger.error("SQLite error during backup creation: %s", sql_e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
             return None
         except Exception as e:
-            logger.error(f"Error creating database backup: {e}")
-            logger.debug(traceback.format_exc())
+            logger.error("Error creating database backup: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
             return None
         finally:
             # Ensure connections are closed even if an exception occurs
@@ -89,12 +136,14 @@ class BackupManager:
             if dest:
                 dest.close()
     
-    def restore_backup(self, backup_path):
+    def restore_backup(self, backup_path, progress_callback=None):
         """
         Restore database from a backup
         
         Args:
             backup_path: Path to the backup file
+            progress_callback: Optional callable(status, remaining, total) invoked
+                after each batch of pages is copied
             
         Returns:
             True if successful, False otherwise
@@ -106,59 +155,67 @@ class BackupManager:
         try:
             # Check if the backup file exists
             if not os.path.exists(backup_path):
-                logger.error(f"Backup file not found: {backup_path}")
+                logger.error("Backup file not found: %s", backup_path)
                 return False
                 
-            # Validate backup file is a valid SQLite database
-            try:
-                test_conn = sqlite3.connect(backup_path)
-                test_conn.cursor().execute("SELECT name FROM sqlite_master WHERE type='table';")
-                test_conn.close()
-            except sqlite3.Error as e:
-                logger.error(f"Invalid backup file (not a valid SQLite database): {backup_path}. Error: {e}")
+            # Validate backup file is a SQLite database by its header
+            with open(backup_path, 'rb') as f:
+                header = f.read(len(SQLITE_HEADER))
+            if header != SQLITE_HEADER:
+                logger.error("Invalid backup file (not a valid SQLite database): %s", backup_path)
                 return False
             
-            # Create a temporary copy of the current database
+            # Snapshot of the current database kept for rollback
             temp_path = f"{self.db_path}.temp"
-            logger.debug(f"Creating temporary backup of current database at {temp_path}")
+            snapshot_taken = False
             
-            if os.path.exists(self.db_path):
-                shutil.copy2(self.db_path, temp_path)
-            else:
-                logger.warning(f"Current database file does not exist: {self.db_path}")
-                # Create an empty file as a placeholder
-                with open(temp_path, 'wb') as f:
-                    pass
+            if not os.path.exists(self.db_path):
+                logger.warning("Current database file does not exist: %s", self.db_path)
             
             try:
-                # Close any open connections to the database
-                logger.debug(f"Opening source backup database: {backup_path}")
-                source = sqlite3.connect(backup_path)
+                logger.debug("Opening destination database: %s", self.db_path)
+                dest = sqlite3.connect(self.db_path, timeout=SQLITE_TIMEOUT, isolation_level=None)
+                self._ensure_wal(dest)
                 
-                logger.debug(f"Opening destination database: {self.db_path}")
-                dest = sqlite3.connect(self.db_path)
+                # VACUUM INTO writes a consistent snapshot in one pass, including
+                # any changes still sitting in the WAL file
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                logger.debug("Creating temporary snapshot of current database at %s", temp_path)
+                dest.execute("VACUUM INTO ?", (temp_path,))
+                snapshot_taken = True
+                
+                logger.debug("Opening source backup database: %s", backup_path)
+                source = sqlite3.connect(backup_path, timeout=SQLITE_TIMEOUT, isolation_level=None)
                 
                 logger.debug("Starting database restore process")
-                source.backup(dest)
+                self._copy_database(source, dest, progress_callback)
                 
-                logger.info(f"Database successfully restored from backup: {backup_path}")
+                logger.info("Database successfully restored from backup: %s", backup_path)
                 return True
                 
             except Exception as e:
-                logger.error(f"Error during database restore: {e}")
-                logger.debug(traceback.format_exc())
+                logger.error("Error during database restore: %s", e)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(traceback.format_exc())
                 
-                # Restore the original database from the temporary copy
-                logger.debug("Attempting to roll back to the original database state")
-                if os.path.exists(temp_path):
-                    shutil.copy2(temp_path, self.db_path)
+                # Copy the snapshot back through the backup API so connections
+                # that still have the database open see the rolled back state
+                if snapshot_taken and dest:
+                    logger.debug("Attempting to roll back to the original database state")
+                    snapshot = sqlite3.connect(temp_path, timeout=SQLITE_TIMEOUT)
+                    try:
+                        self._copy_database(snapshot, dest)
+                    finally:
+                        snapshot.close()
                     logger.info("Successfully rolled back to the original database state")
                 
                 return False
                 
         except Exception as e:
-            logger.error(f"Error during backup restoration process: {e}")
-            logger.debug(traceback.format_exc())
+            logger.error("Error during backup restoration process: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
             return False
         finally:
             # Clean up resources
@@ -169,39 +226,117 @@ class BackupManager:
             if temp_path and os.path.exists(temp_path):
                 try:
                     os.remove(temp_path)
-                    logger.debug(f"Removed temporary database file: {temp_path}")
+                    logger.debug("Removed temporary database file: %s", temp_path)
                 except Exception as e:
-                    logger.warning(f"Failed to remove temporary file {temp_path}: {e}")
+                    logger.warning("Failed to remove temporary file %s: %s", temp_path, e)
     
-    def list_backups(self):
+    def _copy_database(self, source, dest, progress_callback=None):
+        """Copy one SQLite database into another using the backup API
+        
+        Args:
+            source: Open connection to copy from
+            dest: Open connection to copy into
+            progress_callback: Optional callable(status, remaining, total); when given,
+                the copy runs in batches so the caller can report progress between them
+        """
+        delay = BACKUP_RETRY_DELAY
+        for attempt in range(1, BACKUP_RETRY_ATTEMPTS + 1):
+            try:
+                if progress_callback is None:
+                    source.backup(dest, pages=BACKUP_PAGES_PER_STEP)
+                else:
+                    source.backup(dest, pages=BACKUP_PROGRESS_PAGES_PER_STEP, progress=progress_callback)
+                return
+            except sqlite3.OperationalError as e:
+                # Another connection held a lock for longer than the busy timeout
+                if attempt == BACKUP_RETRY_ATTEMPTS:
+                    raise
+                logger.warning("Database copy attempt %d failed (%s), retrying in %.1fs",
+                               attempt, e, delay)
+                time.sleep(delay)
+                delay *= 2
+    
+    def _ensure_wal(self, conn):
+        """Switch the live database to WAL mode once so backups do not block writers
+        
+        Args:
+            conn: Open connection to the live database
+        """
+        if self._wal_checked or self.db_path == ':memory:':
+            return
+        
+        try:
+            journal_mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            logger.debug("Database journal mode: %s", journal_mode)
+            self._wal_checked = True
+        except sqlite3.Error as e:
+            # Not fatal: the copy still works in rollback-journal mode
+            logger.warning("Could not enable WAL mode on %s: %s", self.db_path, e)
+    
+    def list_backups(self, use_cache=True):
         """List all available backups
         
+        Args:
+            use_cache: Reuse the previous listing if it is younger than the cache TTL
+            
         Returns:
             List of backup files with timestamps
         """
+        if (use_cache and self._list_cache is not None
+                and time.monotonic() - self._list_cache_ts < self._list_ttl):
+            return list(self._list_cache)
+        
         try:
-            backups = []
-            
-            # List all backup files
-            for filename in os.listdir(self.backup_dir):
-                if filename.startswith("budget_backup_") and filename.endswith(".db"):
-                    backup_path = os.path.join(self.backup_dir, filename)
-                    created_time = os.path.getctime(backup_path)
-                    
-                    backups.append({
-                        'filename': filename,
-                        'path': backup_path,
-                        'created': datetime.datetime.fromtimestamp(created_time),
-                        'size': os.path.getsize(backup_path)
-                    })
-            
-            # Sort by creation time (newest first)
-            backups.sort(key=lambda x: x['created'], reverse=True)
-            return backups
-            
+            backups = self._scan_backups()
         except Exception as e:
-            logger.error(f"Error listing backups: {e}")
+            logger.error("Error listing backups: %s", e)
             return []
+        
+        # Sort by creation time (newest first)
+        backups.sort(key=lambda x: x['created'], reverse=True)
+        
+        self._list_cache = backups
+        self._list_cache_ts = time.monotonic()
+        return list(backups)
+    
+    def _scan_backups(self, include_size=True):
+        """Scan the backup directory for backup files
+        
+        Args:
+            include_size: Stat each file for its size; cleanup only needs timestamps
+            
+        Returns:
+            Unsorted list of backup files with timestamps
+        """
+        backups = []
+        
+        with os.scandir(self.backup_dir) as entries:
+            for entry in entries:
+                match = BACKUP_FILENAME_RE.match(entry.name)
+                if not match:
+                    continue
+                
+                # The creation time is encoded in the filename by create_backup
+                try:
+                    created = datetime.datetime.strptime(match.group(1), '%Y%m%d_%H%M%S')
+                except ValueError:
+                    created = datetime.datetime.fromtimestamp(entry.stat().st_ctime)
+                
+                backup = {
+                    'filename': entry.name,
+                    'path': entry.path,
+                    'created': created
+                }
+                if include_size:
+                    backup['size'] = entry.stat().st_size
+                backups.append(backup)
+        
+        return backups
+    
+    def _invalidate_list_cache(self):
+        """Force the next list_backups call to rescan the backup directory"""
+        self._list_cache = None
+        self._list_cache_ts = 0.0
     
     def clean_old_backups(self, max_backups=10):
         """Remove old backups, keeping only the most recent ones
@@ -213,25 +348,32 @@ class BackupManager:
             Number of backups removed
         """
         try:
-            backups = self.list_backups()
+            # Always work from a fresh scan so cached entries are never deleted twice
+            backups = self._scan_backups(include_size=False)
             
             # If we have more backups than the maximum, remove the oldest ones
             if len(backups) > max_backups:
-                backups_to_remove = backups[max_backups:]
+                # Select the newest backups to keep without sorting the whole list
+                keep_paths = {
+                    backup['path']
+                    for backup in heapq.nlargest(max_backups, backups, key=lambda x: x['created'])
+                }
+                backups_to_remove = [backup for backup in backups if backup['path'] not in keep_paths]
                 removed_count = 0
                 
                 for backup in backups_to_remove:
                     try:
                         os.remove(backup['path'])
                         removed_count += 1
-                        logger.info(f"Removed old backup: {backup['filename']}")
+                        logger.info("Removed old backup: %s", backup['filename'])
                     except Exception as e:
-                        logger.error(f"Error removing backup {backup['filename']}: {e}")
+                        logger.error("Error removing backup %s: %s", backup['filename'], e)
                 
+                self._invalidate_list_cache()
                 return removed_count
             
             return 0
             
         except Exception as e:
-            logger.error(f"Error cleaning old backups: {e}")
+            logger.error("Error cleaning old backups: %s", e)
             return 0
@@ -5,6 +5,9 @@ import numpy as np
 from collections import defaultdict
 from typing import Tuple, Dict, List, Optional, Union
 
+# Month names indexed by month number (index 0 is an empty string)
+MONTH_NAMES = tuple(calendar.month_name)
+
 class BudgetForecaster:
     """
     Class for forecasting budget scenarios based on current financial data.
@@ -24,6 +27,15 @@ class BudgetForecaster:
         self.DEFAULT_EXTRA_PAYMENT = 100.00
         self.DEFAULT_MIN_PAYMENT_PERCENT = 0.03
         self.ABSOLUTE_MIN_PAYMENT = 25.00  # Minimum $25 payment
+        
+        # Current-month snapshots keyed by (user_id, year, month). Dropped
+        # whenever db.data_version moves.
+        self._snapshot_cache = {}
+        self._snapshot_version = None
+        
+        # Longest run of month labels generated for the current (year, month)
+        self._month_labels_key = None
+        self._month_labels = []
     
     def _get_current_financial_snapshot(self, user_id):
         """Get a snapshot of the user's current financial situation.
@@ -34,8 +46,49 @@ class BudgetForecaster:
         Returns:
             tuple: (monthly_income, regular_expenses, total_debt, monthly_debt_payment, monthly_interest)
         """
-        # Calculate date range for current month
+        snapshot = self._get_snapshot_data(user_id)
+        return (
+            snapshot['monthly_income'],
+            snapshot['regular_expenses'],
+            snapshot['total_debt'],
+            snapshot['monthly_debt_payment'],
+            snapshot['monthly_interest']
+        )
+    
+    def _get_snapshot_data(self, user_id):
+        """Get the cached financial snapshot for the current month, loading it if needed.
+        
+        Args:
+            user_id: User ID to get data for
+            
+        Returns:
+            dict: Snapshot values keyed by name
+        """
+        data_version = self.budget_manager.db.data_version
+        if self._snapshot_version != data_version:
+            self._snapshot_cache.clear()
+            self._snapshot_version = data_version
+        
         today = datetime.date.today()
+        cache_key = (user_id, today.year, today.month)
+        
+        snapshot = self._snapshot_cache.get(cache_key)
+        if snapshot is None:
+            snapshot = self._load_financial_snapshot(user_id, today)
+            self._snapshot_cache[cache_key] = snapshot
+        return snapshot
+    
+    def _load_financial_snapshot(self, user_id, today):
+        """Query the budget manager for the current month's financial data.
+        
+        Args:
+            user_id: User ID to get data for
+            today: Date used to determine the current month
+            
+        Returns:
+            dict: Snapshot values keyed by name
+        """
+        # Calculate date range for current month
         start_date = datetime.date(today.year, today.month, 1)
         end_date = datetime.date(
             today.year, today.month,
@@ -54,20 +107,60 @@ class BudgetForecaster:
             if 'Debt' not in category:
                 regular_expenses += amount
         
-        # Get debt-related data
-        debt_expenses = self.budget_manager.get_debt_expenses(user_id)
-        total_debt = sum(expense.amount for expense in debt_expenses)
+        # Get debt-related data as parallel arrays
+        debt_balances = self.budget_manager.get_debt_balances(user_id, start_date, end_date)
+        debt_count = len(debt_balances)
+        amounts = np.fromiter((amount for amount, apr in debt_balances), dtype=np.float64, count=debt_count)
+        aprs = np.fromiter((apr for amount, apr in debt_balances), dtype=np.float64, count=debt_count)
+        total_debt = float(amounts.sum())
         
         # Calculate minimum monthly payment
         monthly_debt_payment = max(total_debt * 0.03, 25.00) if total_debt > 0 else 0
         
-        # Calculate monthly interest
-        monthly_interest = sum(
-            self.budget_manager.calculate_monthly_interest(expense.amount, expense.apr)
-            for expense in debt_expenses
-        )
+        # Calculate monthly interest and weighted average APR in one pass
+        apr_weighted_total = float((amounts * aprs).sum())
+        monthly_interest = apr_weighted_total / 100 / 12
+        weighted_apr = apr_weighted_total / total_debt if total_debt > 0 else 0.0
+        
+        return {
+            'monthly_income': monthly_income,
+            'expenses_by_category': expense_by_category,
+            'regular_expenses': regular_expenses,
+            'debt_balances': debt_balances,
+            'total_debt': total_debt,
+            'monthly_debt_payment': monthly_debt_payment,
+            'monthly_interest': monthly_interest,
+            'weighted_apr': weighted_apr
+        }
+    
+    def _get_forecast_month_names(self, months):
+        """Get 'Month YYYY' labels for consecutive months starting with the current month.
+        
+        Args:
+            months: Number of month labels to generate
+            
+        Returns:
+            list: Month labels in forecast order
+        """
+        today = datetime.date.today()
+        labels_key = (today.year, today.month)
         
-        return monthly_income, regular_expenses, total_debt, monthly_debt_payment, monthly_interest
+        # Labels only depend on the starting month, so reuse the longest list built so far
+        if labels_key != self._month_labels_key or len(self._month_labels) < months:
+            month_offsets = today.month - 1 + np.arange(max(months, self.DEFAULT_FORECAST_MONTHS))
+            month_numbers = month_offsets % 12 + 1
+            years = today.year + month_offsets // 12
+            self._month_labels = [
+                f"{MONTH_NAMES[month]} {year}"
+                for month, year in zip(month_numbers.tolist(), years.tolist())
+            ]
+            self._month_labels_key = labels_key
+        
+        return self._month_labels[:months]
+    
+    def clear_snapshot_cache(self):
+        """Discard cached financial snapshots so the next forecast re-reads the database."""
+        self._snapshot_cache.clear()
         
     def forecast_monthly_cash_flow(self, user_id, months=12) -> pd.DataFrame:
         """Forecast monthly cash flow for the specified number of months."""
@@ -86,37 +179,18 @@ class BudgetForecaster:
             self._get_current_financial_snapshot(user_id)
         )
         
-        today = datetime.date.today()
-        
-        # Create forecast data
-        forecast_data = []
+        # Assume income and regular expenses remain constant
+        # This can be enhanced with trend analysis in future versions
+        net_cash_flow = monthly_income - regular_expenses - monthly_debt_payment
         
-        for i in range(months):
-            # Calculate month and year
-            future_month = (today.month + i) % 12 or 12  # Convert 0 to 12
-            future_year = today.year + (today.month + i - 1) // 12
-            month_name = f"{calendar.month_name[future_month]} {future_year}"
-            
-            # Assume income and regular expenses remain constant
-            # This can be enhanced with trend analysis in future versions
-            projected_income = monthly_income
-            projected_expenses = regular_expenses
-            projected_debt_payment = monthly_debt_payment
-            projected_interest = monthly_interest
-            
-            # Calculate net cash flow
-            net_cash_flow = projected_income - projected_expenses - projected_debt_payment
-            
-            forecast_data.append({
-                'Month': month_name,
-                'Income': projected_income,
-                'Expenses': projected_expenses,
-                'Debt Payment': projected_debt_payment,
-                'Interest Paid': projected_interest,
-                'Net Cash Flow': net_cash_flow
-            })
-        
-        return pd.DataFrame(forecast_data)
+        return pd.DataFrame({
+            'Month': self._get_forecast_month_names(months),
+            'Income': np.full(months, monthly_income),
+            'Expenses': np.full(months, regular_expenses),
+            'Debt Payment': np.full(months, monthly_debt_payment),
+            'Interest Paid': np.full(months, monthly_interest),
+            'Net Cash Flow': np.full(months, net_cash_flow)
+        })
     
     def forecast_with_debt_payoff(self, user_id, months=24, extra_payment=0.0) -> pd.DataFrame:
         """Forecast debt payoff with optional extra monthly payment."""
@@ -132,56 +206,49 @@ class BudgetForecaster:
             DataFrame with debt payoff projections
         """
         # Get current financial data
-        _, _, total_debt, min_monthly_payment, monthly_interest = (
-            self._get_current_financial_snapshot(user_id)
-        )
+        snapshot = self._get_snapshot_data(user_id)
+        total_debt = snapshot['total_debt']
+        min_monthly_payment = snapshot['monthly_debt_payment']
         
         # If no debt, return empty DataFrame
         if total_debt <= 0:
             return pd.DataFrame()
             
-        # Calculate weighted average APR
-        debt_expenses = self.budget_manager.get_debt_expenses(user_id)
-        weighted_apr = sum(
-            expense.amount * expense.apr for expense in debt_expenses
-        ) / total_debt
+        # Weighted average APR
+        weighted_apr = snapshot['weighted_apr']
         
-        # Create forecast data
-        forecast_data = []
-        remaining_balance = total_debt
-        month = 0
+        # Monthly rate and fixed payment
+        rate = weighted_apr / 100 / 12
+        payment = min_monthly_payment + extra_payment
         
-        today = datetime.date.today()
+        # Opening balance for each month from the closed-form amortization formula
+        month_index = np.arange(months)
+        if rate > 0:
+            growth = (1 + rate) ** month_index
+            opening_balance = total_debt * growth - payment * (growth - 1) / rate
+        else:
+            opening_balance = total_debt - payment * month_index
         
-        while remaining_balance > 0 and month < months:
-            # Calculate month and year
-            future_month = (today.month + month) % 12 or 12
-            future_year = today.year + (today.month + month - 1) // 12
-            month_name = f"{calendar.month_name[future_month]} {future_year}"
-            
-            # Calculate interest for the month
-            monthly_interest = remaining_balance * (weighted_apr / 100) / 12
-            
-            # Apply regular payment + extra payment
-            total_payment = min(remaining_balance + monthly_interest, min_monthly_payment + extra_payment)
-            principal_payment = total_payment - monthly_interest
-            
-            # Update remaining balance
-            remaining_balance -= principal_payment
-            
-            forecast_data.append({
-                'Month': month_name,
-                'Debt Balance': remaining_balance + principal_payment,
-                'Regular Payment': min_monthly_payment,
-                'Extra Payment': extra_payment,
-                'Interest Paid': monthly_interest,
-                'Principal Paid': principal_payment,
-                'Remaining Balance': remaining_balance
-            })
-            
-            month += 1
+        # Stop at the first month that starts with nothing left to pay
+        paid_off = np.flatnonzero(opening_balance <= 0)
+        if paid_off.size:
+            opening_balance = opening_balance[:paid_off[0]]
         
-        return pd.DataFrame(forecast_data)
+        # Interest accrues on the opening balance; the last payment only covers what is owed
+        interest = opening_balance * rate
+        total_payment = np.minimum(opening_balance + interest, payment)
+        principal = total_payment - interest
+        remaining_balance = opening_balance - principal
+        
+        return pd.DataFrame({
+            'Month': self._get_forecast_month_names(len(opening_balance)),
+            'Debt Balance': opening_balance,
+            'Regular Payment': np.full(len(opening_balance), min_monthly_payment),
+            'Extra Payment': np.full(len(opening_balance), extra_payment),
+            'Interest Paid': interest,
+            'Principal Paid': principal,
+            'Remaining Balance': remaining_balance
+        })
     
     def forecast_savings_goal(self, user_id, target_amount, monthly_contribution=None) -> Tuple[int, pd.DataFrame]:
         """Forecast time to reach a savings goal."""
@@ -213,28 +280,16 @@ class BudgetForecaster:
             
         months_to_goal = int(np.ceil(target_amount / monthly_contribution))
         
-        # Create forecast data
-        forecast_data = []
-        current_savings = 0
-        today = datetime.date.today()
+        # Savings balance after each monthly contribution
+        contributions = np.full(months_to_goal, monthly_contribution)
+        savings_balance = np.cumsum(contributions)
         
-        for month in range(months_to_goal):
-            # Calculate month and year
-            future_month = (today.month + month) % 12 or 12
-            future_year = today.year + (today.month + month - 1) // 12
-            month_name = f"{calendar.month_name[future_month]} {future_year}"
-            
-            # Update savings balance
-            current_savings += monthly_contribution
-            
-            forecast_data.append({
-                'Month': month_name,
-                'Monthly Contribution': monthly_contribution,
-                'Savings Balance': current_savings,
-                'Progress': min(current_savings / target_amount * 100, 100.0)
-            })
-        
-        return months_to_goal, pd.DataFrame(forecast_data)
+        return months_to_goal, pd.DataFrame({
+            'Month': self._get_forecast_month_names(months_to_goal),
+            'Monthly Contribution': contributions,
+            'Savings Balance': savings_balance,
+            'Progress': np.minimum(savings_balance / target_amount * 100, 100.0)
+        })
     
     def forecast_spending_categories(self, user_id, months=6) -> Dict[str, Dict[str, float]]:
         """Forecast spending by category for the specified number of months."""
@@ -249,22 +304,15 @@ class BudgetForecaster:
             Dictionary of category forecasts
         """
         # Get categories with their current month spending
-        today = datetime.date.today()
-        start_date = datetime.date(today.year, today.month, 1)
-        end_date = datetime.date(
-            today.year, today.month,
-            calendar.monthrange(today.year, today.month)[1]
-        )
-        
-        # Get expenses by category
-        expenses_by_category = self.budget_manager.get_expenses_by_category(user_id, start_date, end_date)
+        expenses_by_category = self._get_snapshot_data(user_id)['expenses_by_category']
         
-        # Create forecast
-        forecast = {}
-        for category, amount in expenses_by_category.items():
-            forecast[category] = {
-                'Monthly': amount,
-                'Projected': amount * months
-            }
+        # Project every category in one array operation
+        categories = list(expenses_by_category.keys())
+        monthly = np.fromiter(expenses_by_category.values(), dtype=np.float64, count=len(categories))
+        projected = monthly * months
         
-        return forecast
+        return {
+            category: {'Monthly': monthly_amount, 'Projected': projected_amount}
+            for category, monthly_amount, projected_amount
+            in zip(categories, monthly.tolist(), projected.tolist())
+        }
@@ -1,12 +1,41 @@
 import datetime
 from dateutil.relativedelta import relativedelta
 import calendar
+from functools import lru_cache
+from sqlalchemy import func
 from db_handler import DatabaseHandler
 import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 import io
+import numpy as np
+
+# Converts an APR percentage to a monthly rate
+MONTHLY_RATE_FACTOR = 1.0 / 1200.0
+
+# Rows fetched per round trip when streaming report queries
+REPORT_BATCH_SIZE = 1000
+
+# Column layouts and dtypes for the report DataFrames
+DEBT_REPORT_DTYPES = {
+    'id': 'object', 'date': 'object', 'description': 'object', 'category': 'object',
+    'amount': 'float64', 'apr': 'float64', 'monthly_interest': 'float64', 'annual_interest': 'float64'
+}
+EXPENSE_REPORT_DTYPES = {'date': 'object', 'amount': 'float64', 'category': 'object', 'description': 'object'}
+INCOME_REPORT_DTYPES = {'date': 'object', 'amount': 'float64', 'source': 'object', 'description': 'object'}
+
+DEBT_REPORT_COLUMNS = list(DEBT_REPORT_DTYPES)
+EXPENSE_REPORT_COLUMNS = list(EXPENSE_REPORT_DTYPES)
+INCOME_REPORT_COLUMNS = list(INCOME_REPORT_DTYPES)
+MONTHLY_SUMMARY_COLUMNS = ['Period', 'Month', 'Year', 'Total Income', 'Total Expenses',
+                           'Debt Principal', 'Interest Paid', 'Net Savings']
+
+def _empty_report(dtypes):
+    """Build an empty DataFrame with the given column dtypes."""
+    return pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in dtypes.items()})
+
+# Templates copied for reports with no rows, skipping dtype inference
+_EMPTY_DEBT_REPORT = _empty_report(DEBT_REPORT_DTYPES)
+_EMPTY_EXPENSE_REPORT = _empty_report(EXPENSE_REPORT_DTYPES)
+_EMPTY_INCOME_REPORT = _empty_report(INCOME_REPORT_DTYPES)
 
 class BudgetManager:
     def __init__(self, db_handler=None, db_path='sqlite:///budget.db'):
@@ -21,6 +50,57 @@ class BudgetManager:
         else:
             self.db = DatabaseHandler(db_path)
         
+        # Reused between pie chart renders; matplotlib is imported on first use
+        self._pie_fig = None
+        
+        # Totals for closed months, keyed by (user_id, 'YYYY-MM'); None marks a
+        # month with no income or expenses. Dropped whenever db.data_version moves.
+        self._monthly_totals_cache = {}
+        self._monthly_totals_version = None
+        
+    # Date helpers
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _month_range(year, month):
+        """Return the first and last day of a month.
+        
+        Args:
+            year: Calendar year
+            month: Month number (1-12)
+            
+        Returns:
+            Tuple of (first_day, last_day) dates
+        """
+        last_day = calendar.monthrange(year, month)[1]
+        return datetime.date(year, month, 1), datetime.date(year, month, last_day)
+    
+    def _current_month_range(self):
+        """Return the first and last day of the current month."""
+        today = datetime.date.today()
+        return self._month_range(today.year, today.month)
+    
+    def _resolve_range(self, start_date, end_date):
+        """Fill in a missing start or end date from the current month."""
+        if start_date is None or end_date is None:
+            month_start, month_end = self._current_month_range()
+            if start_date is None:
+                start_date = month_start
+            if end_date is None:
+                end_date = month_end
+        return start_date, end_date
+    
+    @classmethod
+    def _whole_months(cls, start_date, end_date):
+        """Return the (year, month) pairs of a range made up of whole months.
+        
+        Returns None if the range starts or ends partway through a month.
+        """
+        if start_date.day != 1 or end_date != cls._month_range(end_date.year, end_date.month)[1]:
+            return None
+        start_ord = start_date.year * 12 + start_date.month - 1
+        end_ord = end_date.year * 12 + end_date.month - 1
+        return [(ordinal // 12, ordinal % 12 + 1) for ordinal in range(start_ord, end_ord + 1)]
+    
     # User management
     def create_user(self, name, email):
         """Create a new user."""
@@ -64,145 +144,191 @@ class BudgetManager:
     
     def get_total_income(self, user_id, start_date=None, end_date=None):
         """Get total income for a user within a date range."""
-        if start_date is None:
-            # Default to current month
-            today = datetime.date.today()
-            start_date = datetime.date(today.year, today.month, 1)
+        start_date, end_date = self._resolve_range(start_date, end_date)
         
-        if end_date is None:
-            # Default to end of current month
-            today = datetime.date.today()
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            end_date = datetime.date(today.year, today.month, last_day)
-        
-        incomes = self.db.get_incomes_by_date_range(user_id, start_date, end_date)
-        return sum(income.amount for income in incomes)
+        return self.db.get_income_sum(user_id, start_date, end_date)
     
     # Expense management
     def add_expense(self, user_id, category_id, amount, description="", date=None, has_apr=0, apr=0.0):
         """Add a new expense record."""
         return self.db.add_expense(user_id, category_id, amount, description, date, has_apr, apr)
         
-    def calculate_monthly_interest(self, amount, apr):
-        """Calculate the monthly interest amount based on APR."""
-        # Convert annual rate to monthly
-        monthly_rate = apr / 100 / 12
-        return amount * monthly_rate
+    @staticmethod
+    def calculate_monthly_interest(amount, apr):
+        """Calculate the monthly interest amount based on APR.
+        
+        Works element-wise when given NumPy arrays of amounts and APRs.
+        """
+        # APR percent to monthly rate: apr / 100 / 12
+        return amount * apr * MONTHLY_RATE_FACTOR
         
     def get_debt_expenses(self, user_id, start_date=None, end_date=None):
         """Get all APR-bearing expenses within a date range."""
-        if start_date is None:
-            # Default to current month
-            today = datetime.date.today()
-            start_date = datetime.date(today.year, today.month, 1)
+        start_date, end_date = self._resolve_range(start_date, end_date)
         
-        if end_date is None:
-            # Default to end of current month
-            today = datetime.date.today()
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            end_date = datetime.date(today.year, today.month, last_day)
+        # Only load expenses with APR (has_apr is an Integer field, 1 = yes, 0 = no)
+        with self.db.session_scope() as session:
+            return session.query(self.db.Expense).\
+                filter(self.db.Expense.user_id == user_id,
+                       self.db.Expense.date >= start_date,
+                       self.db.Expense.date <= end_date,
+                       self.db.Expense.has_apr == 1).all()
+    
+    def get_debt_balances(self, user_id, start_date=None, end_date=None):
+        """Get (amount, apr) pairs for APR-bearing expenses within a date range.
+        
+        Lighter than get_debt_expenses when only the numbers are needed, since
+        rows come back as plain tuples instead of mapped Expense objects.
+        
+        Returns:
+            List of (amount, apr) tuples
+        """
+        start_date, end_date = self._resolve_range(start_date, end_date)
         
-        # Get all expenses in date range
-        expenses = self.db.get_expenses_by_date_range(user_id, start_date, end_date)
+        with self.db.session_scope() as session:
+            return session.query(self.db.Expense.amount, self.db.Expense.apr).\
+                filter(self.db.Expense.user_id == user_id,
+                       self.db.Expense.date >= start_date,
+                       self.db.Expense.date <= end_date,
+                       self.db.Expense.has_apr == 1).all()
+    
+    def get_debt_details(self, user_id, start_date, end_date):
+        """Get APR-bearing expenses within a date range with their category names.
         
-        # Filter for only those with APR (has_apr is an Integer field, 1 = yes, 0 = no)
-        debt_expenses = [expense for expense in expenses if expense.has_apr == 1]
+        The category name is joined in, so callers needing it do not look up
+        each debt's category separately.
         
-        return debt_expenses
+        Returns:
+            List of (id, description, category_name, amount, apr) tuples, with
+            'Unknown' for expenses without a category
+        """
+        with self.db.session_scope() as session:
+            return session.query(self.db.Expense.id,
+                                 self.db.Expense.description,
+                                 func.coalesce(self.db.Category.name, 'Unknown'),
+                                 self.db.Expense.amount,
+                                 self.db.Expense.apr).\
+                outerjoin(self.db.Category, self.db.Expense.category_id == self.db.Category.id).\
+                filter(self.db.Expense.user_id == user_id,
+                       self.db.Expense.date >= start_date,
+                       self.db.Expense.date <= end_date,
+                       self.db.Expense.has_apr == 1).all()
         
     def generate_debt_report(self, user_id, start_date=None, end_date=None):
         """Generate a detailed report of all debt expenses with APR."""
-        if start_date is None:
-            # Default to current month
-            today = datetime.date.today()
-            start_date = datetime.date(today.year, today.month, 1)
-        
-        if end_date is None:
-            # Default to end of current month
-            today = datetime.date.today()
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            end_date = datetime.date(today.year, today.month, last_day)
+        start_date, end_date = self._resolve_range(start_date, end_date)
             
         # Use a single session for all database operations
-        session = self.db.get_session()
-        try:
-            from sqlalchemy.orm import joinedload
-            
-            # Get all debt expenses with their categories in a single query
-            expenses_query = session.query(self.db.Expense).\
+        with self.db.session_scope() as session:
+            # Select only the report columns, with the category name joined in,
+            # so rows come back as plain tuples rather than mapped objects
+            debt_query = session.query(self.db.Expense.id,
+                                       self.db.Expense.date,
+                                       self.db.Expense.description,
+                                       func.coalesce(self.db.Category.name, 'Unknown'),
+                                       self.db.Expense.amount,
+                                       self.db.Expense.apr).\
+                outerjoin(self.db.Category, self.db.Expense.category_id == self.db.Category.id).\
                 filter(self.db.Expense.user_id == user_id,
                        self.db.Expense.date >= start_date,
                        self.db.Expense.date <= end_date,
-                       self.db.Expense.has_apr == 1).\
-                options(joinedload(self.db.Expense.category))
-                
-            debt_expenses = expenses_query.all()
-            
-            data = []
-            total_principal = 0
-            total_monthly_interest = 0
-            total_annual_interest = 0
+                       self.db.Expense.has_apr == 1)
             
-            for expense in debt_expenses:
-                # Get category name
-                category_name = expense.category.name if expense.category else "Unknown"
-                
-                # Calculate interest
-                monthly_interest = self.calculate_monthly_interest(expense.amount, expense.apr)
-                annual_interest = monthly_interest * 12
-                
-                # Track totals
-                total_principal += expense.amount
-                total_monthly_interest += monthly_interest
-                total_annual_interest += annual_interest
-                
-                data.append({
-                    'id': expense.id,
-                    'date': expense.date,
-                    'description': expense.description,
-                    'category': category_name,
-                    'amount': expense.amount,
-                    'apr': expense.apr,
-                    'monthly_interest': monthly_interest,
-                    'annual_interest': annual_interest
-                })
-            
-            # Add summary row
-            if data:
-                data.append({
-                    'id': 'TOTAL',
-                    'date': None,
-                    'description': 'TOTAL',
-                    'category': '',
-                    'amount': total_principal,
-                    'apr': None,
-                    'monthly_interest': total_monthly_interest,
-                    'annual_interest': total_annual_interest
-                })
-            
-            return pd.DataFrame(data)
-        finally:
-            session.close()
+            # Stream rows in batches for long histories
+            data = [list(row) for row in debt_query.yield_per(REPORT_BATCH_SIZE)]
+        
+        if not data:
+            return _EMPTY_DEBT_REPORT.copy()
+        
+        # Calculate interest for every debt at once
+        amounts = np.fromiter((row[4] for row in data), dtype=np.float64, count=len(data))
+        aprs = np.fromiter((row[5] for row in data), dtype=np.float64, count=len(data))
+        monthly_interests = self.calculate_monthly_interest(amounts, aprs)
+        annual_interests = monthly_interests * 12
+        
+        for row, monthly_interest, annual_interest in zip(data, monthly_interests.tolist(), annual_interests.tolist()):
+            row.append(monthly_interest)
+            row.append(annual_interest)
+        
+        # Add summary row
+        data.append(['TOTAL', None, 'TOTAL', '', float(amounts.sum()), None,
+                     float(monthly_interests.sum()), float(annual_interests.sum())])
+        
+        return pd.DataFrame.from_records(data, columns=DEBT_REPORT_COLUMNS)
     
     def get_total_expense(self, user_id, start_date=None, end_date=None):
         """Get total expense for a user within a date range."""
-        if start_date is None:
-            # Default to current month
-            today = datetime.date.today()
-            start_date = datetime.date(today.year, today.month, 1)
+        start_date, end_date = self._resolve_range(start_date, end_date)
         
-        if end_date is None:
-            # Default to end of current month
-            today = datetime.date.today()
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            end_date = datetime.date(today.year, today.month, last_day)
+        return self.db.get_expense_sum(user_id, start_date, end_date)
+    
+    def get_monthly_income_expense(self, user_id, start_date, end_date, session=None):
+        """Get income and expense totals for each month within a date range.
         
-        expenses = self.db.get_expenses_by_date_range(user_id, start_date, end_date)
-        return sum(expense.amount for expense in expenses)
+        Args:
+            user_id: ID of the user whose totals to retrieve
+            start_date: Start of the range
+            end_date: End of the range
+            session: Optional open session to query with instead of a new one
+            
+        Returns:
+            Dict mapping 'YYYY-MM' to (income_total, expense_total); months
+            without any income or expenses are omitted
+        """
+        months = self._whole_months(start_date, end_date)
+        if not months:
+            return self._query_monthly_income_expense(user_id, start_date, end_date, session)
+        
+        # Any income or expense write since the last call invalidates the cache
+        if self._monthly_totals_version != self.db.data_version:
+            self._monthly_totals_cache.clear()
+            self._monthly_totals_version = self.db.data_version
+        
+        # Months before the current one are closed, so their totals are reused
+        today = datetime.date.today()
+        current_key = f"{today.year:04d}-{today.month:02d}"
+        keys = [f"{year:04d}-{month:02d}" for year, month in months]
+        uncached = [i for i, key in enumerate(keys)
+                    if key >= current_key or (user_id, key) not in self._monthly_totals_cache]
+        
+        fresh = {}
+        first = last = -1
+        if uncached:
+            # One lookup spanning every month that has to be queried
+            first, last = uncached[0], uncached[-1]
+            span_start = self._month_range(*months[first])[0]
+            span_end = self._month_range(*months[last])[1]
+            fresh = self._query_monthly_income_expense(user_id, span_start, span_end, session)
+            for key in keys[first:last + 1]:
+                if key < current_key:
+                    self._monthly_totals_cache[(user_id, key)] = fresh.get(key)
+        
+        totals = {}
+        for i, key in enumerate(keys):
+            if first <= i <= last:
+                month_totals = fresh.get(key)
+            else:
+                month_totals = self._monthly_totals_cache[(user_id, key)]
+            if month_totals is not None:
+                totals[key] = month_totals
+        
+        return totals
+    
+    def _query_monthly_income_expense(self, user_id, start_date, end_date, session=None):
+        """Load per-month income and expense totals from the database."""
+        with self.db.session_scope(session) as session:
+            income_sums = self.db.get_monthly_income_sums(user_id, start_date, end_date, session=session)
+            expense_sums = self.db.get_monthly_expense_sums(user_id, start_date, end_date, session=session)
+        
+        return {month: (income_sums.get(month, 0.0), expense_sums.get(month, 0.0))
+                for month in income_sums.keys() | expense_sums.keys()}
     
     def get_all_expenses(self, user_id):
         """Get all expenses for a user with categories preloaded.
         
+        The whole history is materialized as a list of mapped objects; report
+        builders that only need row values stream with yield_per instead.
+        
         Args:
             user_id: ID of the user whose expenses to retrieve
             
@@ -210,17 +336,14 @@ class BudgetManager:
             List of Expense objects with category relationships preloaded
         """
         # Use a single session for all database operations
-        session = self.db.get_session()
-        try:
+        with self.db.session_scope() as session:
             # Get all expenses with their categories in a single query
-            from sqlalchemy.orm import joinedload
+            from sqlalchemy.orm import selectinload
             expenses_query = session.query(self.db.Expense).\
                 filter(self.db.Expense.user_id == user_id).\
-                options(joinedload(self.db.Expense.category))
+                options(selectinload(self.db.Expense.category))
                 
             return expenses_query.all()
-        finally:
-            session.close()
     
     def get_expenses_by_category(self, user_id, category_id):
         """Get all expenses for a specific category with category data preloaded.
@@ -233,55 +356,84 @@ class BudgetManager:
             List of Expense objects with category relationships preloaded
         """
         # Use a single session for all database operations
-        session = self.db.get_session()
-        try:
+        with self.db.session_scope() as session:
             # Get all expenses with their categories in a single query
-            from sqlalchemy.orm import joinedload
+            from sqlalchemy.orm import selectinload
             expenses_query = session.query(self.db.Expense).\
                 filter(self.db.Expense.user_id == user_id,
                        self.db.Expense.category_id == category_id).\
-                options(joinedload(self.db.Expense.category))
+                options(selectinload(self.db.Expense.category))
                 
             return expenses_query.all()
-        finally:
-            session.close()
     
-    def get_expenses_by_category_summary(self, user_id, start_date=None, end_date=None):
-        """Get expenses grouped by category for a date range."""
-        if start_date is None:
-            # Default to current month
-            today = datetime.date.today()
-            start_date = datetime.date(today.year, today.month, 1)
+    def get_expenses_by_category_summary(self, user_id, start_date=None, end_date=None, return_tuples=False):
+        """Get expenses grouped by category for a date range.
         
-        if end_date is None:
-            # Default to end of current month
-            today = datetime.date.today()
-            last_day = calendar.monthrange(today.year, today.month)[1]
-            end_date = datetime.date(today.year, today.month, last_day)
+        Args:
+            user_id: ID of the user whose expenses to summarize
+            start_date: Start of the range (default: first day of current month)
+            end_date: End of the range (default: last day of current month)
+            return_tuples: If True, return (category, total) rows ordered by
+                total descending instead of a dict
+            
+        Returns:
+            Dict mapping category name to total, or a list of (category, total) tuples
+        """
+        start_date, end_date = self._resolve_range(start_date, end_date)
         
         # Use a single session for all database operations
-        session = self.db.get_session()
-        try:
-            # Get all expenses with their categories in a single query
-            from sqlalchemy.orm import joinedload
-            expenses_query = session.query(self.db.Expense).\
-                filter(self.db.Expense.user_id == user_id,
-                       self.db.Expense.date >= start_date,
-                       self.db.Expense.date <= end_date).\
-                options(joinedload(self.db.Expense.category))
-                
-            expenses = expenses_query.all()
+        with self.db.session_scope() as session:
+            summary_query, category_total = self._category_summary_query(session, user_id, start_date, end_date)
             
-            result = {}
-            for expense in expenses:
-                category_name = expense.category.name if expense.category else "Uncategorized"
-                if category_name not in result:
-                    result[category_name] = 0
-                result[category_name] += expense.amount
+            if return_tuples:
+                return [tuple(row) for row in summary_query.order_by(category_total.desc()).all()]
             
-            return result
-        finally:
-            session.close()
+            return dict(summary_query.all())
+    
+    def _category_summary_query(self, session, user_id, start_date, end_date):
+        """Build the query summing expenses per category name in the database.
+        
+        Returns:
+            Tuple of (query, total_column) so callers can order by the total
+        """
+        category_name = func.coalesce(self.db.Category.name, "Uncategorized")
+        category_total = func.sum(self.db.Expense.amount)
+        summary_query = session.query(category_name, category_total).\
+            select_from(self.db.Expense).\
+            outerjoin(self.db.Category, self.db.Expense.category_id == self.db.Category.id).\
+            filter(self.db.Expense.user_id == user_id,
+                   self.db.Expense.date >= start_date,
+                   self.db.Expense.date <= end_date).\
+            group_by(category_name)
+        return summary_query, category_total
+    
+    def get_dashboard_totals(self, user_id, start_date, end_date, session=None):
+        """Get income, expense and per-category totals for a date range in one session.
+        
+        Args:
+            user_id: ID of the user whose totals to retrieve
+            start_date: Start of the range
+            end_date: End of the range
+            session: Optional open session to query with instead of a new one
+            
+        Returns:
+            Dict with 'income', 'expense' and 'by_category' (category name to total)
+        """
+        with self.db.session_scope(session) as session:
+            income_total = session.query(func.coalesce(func.sum(self.db.Income.amount), 0.0)).\
+                filter(self.db.Income.user_id == user_id,
+                       self.db.Income.date >= start_date,
+                       self.db.Income.date <= end_date).scalar()
+            
+            summary_query, _ = self._category_summary_query(session, user_id, start_date, end_date)
+            by_category = dict(summary_query.all())
+        
+        # Every expense falls in exactly one category group, so the groups add up to the total
+        return {
+            'income': income_total,
+            'expense': sum(by_category.values()),
+            'by_category': by_category
+        }
     
     # Budget management
     def set_budget(self, user_id, category_id, amount, month, year):
@@ -298,41 +450,37 @@ class BudgetManager:
                 year = today.year
         
         # Get start and end dates for the month
-        start_date = datetime.date(year, month, 1)
-        last_day = calendar.monthrange(year, month)[1]
-        end_date = datetime.date(year, month, last_day)
+        start_date, end_date = self._month_range(year, month)
         
         # Use a single session for all operations
-        session = self.db.get_session()
-        try:
-            from sqlalchemy.orm import joinedload
+        with self.db.session_scope() as session:
+            from sqlalchemy.orm import selectinload
             
             # Get budgets for the month with categories pre-loaded
             budgets_query = session.query(self.db.Budget).\
                 filter(self.db.Budget.user_id == user_id,
                       self.db.Budget.month == month,
                       self.db.Budget.year == year).\
-                options(joinedload(self.db.Budget.category))
+                options(selectinload(self.db.Budget.category))
                 
             budgets = budgets_query.all()
             
+            # Get actual spending for every category in one grouped query
+            spent_query = session.query(self.db.Expense.category_id, func.sum(self.db.Expense.amount)).\
+                filter(self.db.Expense.user_id == user_id,
+                      self.db.Expense.date >= start_date,
+                      self.db.Expense.date <= end_date).\
+                group_by(self.db.Expense.category_id)
+            
+            spent_by_category = dict(spent_query.all())
+            
             result = {}
             for budget in budgets:
                 if not budget.category:
                     continue
                     
                 category_name = budget.category.name
-                category_id = budget.category.id
-                
-                # Get actual expenses for this category
-                expenses_query = session.query(self.db.Expense).\
-                    filter(self.db.Expense.user_id == user_id,
-                          self.db.Expense.category_id == category_id,
-                          self.db.Expense.date >= start_date,
-                          self.db.Expense.date <= end_date)
-                          
-                expenses = expenses_query.all()
-                total_spent = sum(expense.amount for expense in expenses)
+                total_spent = spent_by_category.get(budget.category.id, 0)
                 
                 # Calculate remaining budget
                 remaining = budget.amount - total_spent
@@ -346,102 +494,78 @@ class BudgetManager:
                 }
             
             return result
-        finally:
-            session.close()
     
     # Reporting and analytics
     def generate_expense_report(self, user_id, start_date=None, end_date=None):
         """Generate an expense report for a date range."""
-        if start_date is None:
-            # Default to last 3 months
+        if start_date is None or end_date is None:
+            # Default to the last 3 months
             today = datetime.date.today()
-            start_date = today - relativedelta(months=3)
-        
-        if end_date is None:
-            end_date = datetime.date.today()
-        
-        expenses = self.db.get_expenses_by_date_range(user_id, start_date, end_date)
-        
-        data = []
-        for expense in expenses:
-            session = self.db.get_session()
-            category = session.query(expense.category).first()
-            data.append({
-                'date': expense.date,
-                'amount': expense.amount,
-                'category': category.name,
-                'description': expense.description
-            })
-            session.close()
-        
-        return pd.DataFrame(data)
+            if start_date is None:
+                start_date = today - relativedelta(months=3)
+            if end_date is None:
+                end_date = today
+        
+        # Use a single session for all database operations
+        with self.db.session_scope() as session:
+            # Select the report columns directly, in report column order
+            expenses_query = session.query(self.db.Expense.date,
+                                           self.db.Expense.amount,
+                                           func.coalesce(self.db.Category.name, 'Uncategorized'),
+                                           self.db.Expense.description).\
+                outerjoin(self.db.Category, self.db.Expense.category_id == self.db.Category.id).\
+                filter(self.db.Expense.user_id == user_id,
+                       self.db.Expense.date >= start_date,
+                       self.db.Expense.date <= end_date)
+            
+            data = [tuple(row) for row in expenses_query.yield_per(REPORT_BATCH_SIZE)]
+        
+        if not data:
+            return _EMPTY_EXPENSE_REPORT.copy()
+        
+        return pd.DataFrame.from_records(data, columns=EXPENSE_REPORT_COLUMNS)
     
     def generate_income_report(self, user_id, start_date=None, end_date=None):
         """Generate an income report for a date range."""
-        if start_date is None:
-            # Default to last 3 months
+        if start_date is None or end_date is None:
+            # Default to the last 3 months
             today = datetime.date.today()
-            start_date = today - relativedelta(months=3)
-        
-        if end_date is None:
-            end_date = datetime.date.today()
-        
-        incomes = self.db.get_incomes_by_date_range(user_id, start_date, end_date)
+            if start_date is None:
+                start_date = today - relativedelta(months=3)
+            if end_date is None:
+                end_date = today
+        
+        with self.db.session_scope() as session:
+            # Select the report columns directly, in report column order
+            incomes_query = session.query(self.db.Income.date,
+                                          self.db.Income.amount,
+                                          self.db.Income.source,
+                                          self.db.Income.description).\
+                filter(self.db.Income.user_id == user_id,
+                       self.db.Income.date >= start_date,
+                       self.db.Income.date <= end_date)
+            
+            data = [tuple(row) for row in incomes_query.yield_per(REPORT_BATCH_SIZE)]
         
-        data = []
-        for income in incomes:
-            data.append({
-                'date': income.date,
-                'amount': income.amount,
-                'source': income.source,
-                'description': income.description
-            })
+        if not data:
+            return _EMPTY_INCOME_REPORT.copy()
         
-        return pd.DataFrame(data)
-    
-    def generate_monthly_summary(self, user_id, months=12):
-        """Generate a monthly summary of income and expenses."""
-        today = datetime.date.today()
-        end_date = today
-        start_date = today - relativedelta(months=months)
-        
-        # Generate date range by month
-        date_ranges = []
-        for i in range(months):
-            month_date = today - relativedelta(months=months-i-1)
-            month_start = datetime.date(month_date.year, month_date.month, 1)
-            month_end = datetime.date(
-                month_date.year, 
-                month_date.month, 
-                calendar.monthrange(month_date.year, month_date.month)[1]
-            )
-            date_ranges.append((month_start, month_end, f"{month_date.year}-{month_date.month:02d}"))
-        
-        # Get incomes and expenses for each month
-        monthly_data = []
-        for start, end, month_label in date_ranges:
-            income = self.get_total_income(user_id, start, end)
-            expense = self.get_total_expense(user_id, start, end)
-            savings = income - expense
-            
-            monthly_data.append({
-                'month': month_label,
-                'income': income,
-                'expense': expense,
-                'savings': savings
-            })
-        
-        return pd.DataFrame(monthly_data)
+        return pd.DataFrame.from_records(data, columns=INCOME_REPORT_COLUMNS)
     
     def create_expense_pie_chart(self, user_id, start_date=None, end_date=None):
         """Create a pie chart of expenses by category."""
-        expenses_by_category = self.get_expenses_by_category_summary(user_id, start_date, end_date)
+        category_totals = self.get_expenses_by_category_summary(user_id, start_date, end_date, return_tuples=True)
         
-        fig = Figure(figsize=(8, 6))
+        if self._pie_fig is None:
+            from matplotlib.figure import Figure
+            self._pie_fig = Figure(figsize=(8, 6))
+        else:
+            self._pie_fig.clear()
+        
+        fig = self._pie_fig
         ax = fig.add_subplot(111)
         
-        labels = list(expenses_by_category.keys())
-        sizes = list(expenses_by_category.values())
+        labels, sizes = zip(*category_totals) if category_totals else ((), ())
         
         ax.pie(sizes, labels=labels, autopct='%1.1f%%', startangle=90)
         ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
@@ -450,83 +574,76 @@ class BudgetManager:
         
         # Save to a BytesIO object
         buf = io.BytesIO()
-        canvas = FigureCanvas(fig)
-        canvas.print_png(buf)
+        fig.savefig(buf, format='png')
         buf.seek(0)
         
         return buf
     
     def generate_monthly_summary(self, user_id, months=12):
         """Generate monthly summary of income, expenses, and savings."""
+        from sqlalchemy import case
+        
         today = datetime.date.today()
-        data = []
         
-        for i in range(months-1, -1, -1):
-            # Calculate year and month
-            month = today.month - i
-            year = today.year
-            
-            while month <= 0:
-                month += 12
-                year -= 1
-                
-            # Get first and last day of month
-            first_day = datetime.date(year, month, 1)
-            last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
-            period = first_day.strftime('%b %Y')
-            
-            # Use a single session for all database operations
-            session = self.db.get_session()
-            try:
-                # Get incomes for this month
-                income_query = session.query(self.db.Income).filter(
+        # Months covered, oldest first, ending with the current month
+        periods = pd.period_range(end=pd.Period(today, freq='M'), periods=max(months, 0), freq='M')
+        
+        if len(periods) == 0:
+            return pd.DataFrame(columns=MONTHLY_SUMMARY_COLUMNS)
+        
+        first_day = periods[0].start_time.date()
+        last_day = self._month_range(today.year, today.month)[1]
+        
+        # Aggregate every month in one grouped query per table
+        with self.db.session_scope() as session:
+            income_month = func.strftime('%Y-%m', self.db.Income.date)
+            income_rows = session.query(income_month, func.sum(self.db.Income.amount)).\
+                filter(
                     self.db.Income.user_id == user_id,
                     self.db.Income.date >= first_day,
                     self.db.Income.date <= last_day
-                )
-                total_income = sum(income.amount for income in income_query.all())
-                
-                # Get expenses for this month
-                expense_query = session.query(self.db.Expense).filter(
+                ).\
+                group_by(income_month).all()
+            
+            is_debt = self.db.Expense.has_apr == 1
+            expense_month = func.strftime('%Y-%m', self.db.Expense.date)
+            expense_rows = session.query(
+                    expense_month,
+                    func.sum(self.db.Expense.amount),
+                    func.sum(case((is_debt, self.db.Expense.amount), else_=0)),
+                    func.sum(case((is_debt, self.db.Expense.amount * func.coalesce(self.db.Expense.apr, 0) / 1200.0), else_=0))
+                ).\
+                filter(
                     self.db.Expense.user_id == user_id,
                     self.db.Expense.date >= first_day,
                     self.db.Expense.date <= last_day
-                )
-                total_expense = sum(expense.amount for expense in expense_query.all())
-                
-                # Get debt expenses
-                debt_query = session.query(self.db.Expense).filter(
-                    self.db.Expense.user_id == user_id,
-                    self.db.Expense.date >= first_day,
-                    self.db.Expense.date <= last_day,
-                    self.db.Expense.has_apr == 1
-                )
-                debt_expenses = debt_query.all()
-                total_debt = sum(expense.amount for expense in debt_expenses)
-                total_interest = sum(self.calculate_monthly_interest(expense.amount, expense.apr) for expense in debt_expenses)
-                
-                # Calculate net savings
-                net_savings = total_income - total_expense
-                
-                # Add to data
-                data.append({
-                    'Period': period,
-                    'Month': month,
-                    'Year': year,
-                    'Total Income': round(total_income, 2),
-                    'Total Expenses': round(total_expense, 2),
-                    'Debt Principal': round(total_debt, 2),
-                    'Interest Paid': round(total_interest, 2),
-                    'Net Savings': round(net_savings, 2),
-                })
-            finally:
-                session.close()
-        
-        # Create DataFrame from data
-        return pd.DataFrame(data)
+                ).\
+                group_by(expense_month).all()
+        
+        # Align the grouped rows onto a dense month index, filling empty months with 0
+        month_keys = periods.strftime('%Y-%m')
+        income = pd.DataFrame.from_records(income_rows, columns=['month', 'income'], index='month').\
+            reindex(month_keys).fillna(0.0)
+        expenses = pd.DataFrame.from_records(expense_rows, columns=['month', 'expense', 'debt', 'interest'], index='month').\
+            reindex(month_keys).fillna(0.0)
+        
+        summary = pd.DataFrame({
+            'Period': periods.strftime('%b %Y'),
+            'Month': periods.month,
+            'Year': periods.year,
+            'Total Income': income['income'].to_numpy(dtype=np.float64),
+            'Total Expenses': expenses['expense'].to_numpy(dtype=np.float64),
+            'Debt Principal': expenses['debt'].to_numpy(dtype=np.float64),
+            'Interest Paid': expenses['interest'].to_numpy(dtype=np.float64),
+        }, columns=MONTHLY_SUMMARY_COLUMNS)
+        summary['Net Savings'] = summary['Total Income'] - summary['Total Expenses']
+        
+        return summary.round({col: 2 for col in MONTHLY_SUMMARY_COLUMNS[3:]})
     
     def create_monthly_trend_chart(self, user_id, months=6):
         """Create a chart showing monthly income and expense trends"""
+        from matplotlib.figure import Figure
+        
         try:
             # Get data for chart
             df = self.generate_monthly_summary(user_id, months)
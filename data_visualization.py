@@ -7,16 +7,197 @@ in the budget application, using matplotlib for chart generation.
 
 import datetime
 import calendar
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import numpy as np
 import io
 import os
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple, Union, ByteString
 
+# Fixed subplot margins per chart layout. Figure sizes never change, so these
+# stand in for tight_layout's text-measuring pass on every render.
+CHART_MARGINS = {
+    'category_bar': {'left': 0.2, 'right': 0.9, 'top': 0.9, 'bottom': 0.1},
+    'message': {'left': 0.05, 'right': 0.95, 'top': 0.95, 'bottom': 0.05},
+    'income_expense': {'left': 0.08, 'right': 0.97, 'top': 0.92, 'bottom': 0.2},
+    'savings': {'left': 0.1, 'right': 0.88, 'top': 0.92, 'bottom': 0.2},
+    'spending_trends': {'left': 0.08, 'right': 0.78, 'top': 0.92, 'bottom': 0.2},
+}
+
+
+@lru_cache(maxsize=32)
+def _default_date_range(today: datetime.date) -> Tuple[datetime.date, datetime.date]:
+    """
+    Get the default chart date range (last 6 months) ending on the given day
+    
+    Args:
+        today: Current date; caching on it keeps results fresh across midnight
+        
+    Returns:
+        Tuple of (start_date, end_date)
+    """
+    # Start from 6 months ago
+    month_6_ago = today.month - 6
+    year_offset = 0
+    if month_6_ago <= 0:
+        month_6_ago += 12
+        year_offset = -1
+        
+    start_date = datetime.date(today.year + year_offset, month_6_ago, 1)
+    end_date = today
+    
+    return start_date, end_date
+
+
+@lru_cache(maxsize=256)
+def _month_starts(start_date: datetime.date, end_date: datetime.date) -> Tuple[datetime.date, ...]:
+    """
+    Get the first days of the months in a date range
+    
+    Args:
+        start_date: Start date
+        end_date: End date
+        
+    Returns:
+        Tuple of datetime.date objects representing first day of each month
+    """
+    # Count months as year * 12 + (month - 1) so the range is plain integer arithmetic
+    start_ord = start_date.year * 12 + start_date.month - 1
+    end_ord = end_date.year * 12 + end_date.month - 1
+    return tuple(datetime.date(ordinal // 12, ordinal % 12 + 1, 1) for ordinal in range(start_ord, end_ord + 1))
+
+
+@lru_cache(maxsize=256)
+def _month_labels(months: Tuple[datetime.date, ...]) -> Tuple[str, ...]:
+    """
+    Get the axis labels for a month range
+    
+    Cached so the charts of a dashboard, which share one month range, format
+    the labels only once.
+    
+    Args:
+        months: First days of the months, as from _month_starts
+        
+    Returns:
+        Tuple of 'Mon YYYY' labels aligned with months
+    """
+    return tuple(month_date.strftime('%b %Y') for month_date in months)
+
+
+@lru_cache(maxsize=256)
+def _month_keys(months: Tuple[datetime.date, ...]) -> Tuple[str, ...]:
+    """
+    Get the 'YYYY-MM' keys the grouped monthly queries return for a month range
+    
+    Args:
+        months: First days of the months, as from _month_starts
+        
+    Returns:
+        Tuple of 'YYYY-MM' keys aligned with months
+    """
+    return tuple(f'{month_date.year:04d}-{month_date.month:02d}' for month_date in months)
+
+
+@lru_cache(maxsize=256)
+def _months_end(months: Tuple[datetime.date, ...]) -> datetime.date:
+    """
+    Get the last day of a month range, so the range covers its final month in full
+    
+    Args:
+        months: First days of the months, as from _month_starts (non-empty)
+        
+    Returns:
+        Last day of the final month
+    """
+    last_month = months[-1]
+    last_day = calendar.monthrange(last_month.year, last_month.month)[1]
+    return datetime.date(last_month.year, last_month.month, last_day)
+
+
+class LazyDict(dict):
+    """
+    Dictionary whose zero-argument callable values are computed on first access
+    
+    Values are replaced by their result once computed, so each is built at most
+    once and only if a caller actually reads it. Every read path, including
+    copying, unpacking and popping, goes through __getitem__, so callers never
+    see the pending callables.
+    """
+    
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if callable(value):
+            value = value()
+            super().__setitem__(key, value)
+        return value
+    
+    def __iter__(self):
+        # Overriding __iter__ makes dict(d) and {**d} fall back to keys() and
+        # __getitem__ instead of copying the raw values
+        return super().__iter__()
+    
+    def __repr__(self):
+        return repr(dict(self))
+    
+    def __eq__(self, other):
+        return dict(self) == other
+    
+    def __ne__(self, other):
+        return not self == other
+    
+    def __or__(self, other):
+        return dict(self) | other
+    
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+    
+    def values(self):
+        return [self[key] for key in self]
+    
+    def items(self):
+        return [(key, self[key]) for key in self]
+    
+    def copy(self):
+        return dict(self)
+    
+    def pop(self, key, *default):
+        if key not in self:
+            return super().pop(key, *default)
+        value = self[key]
+        super().pop(key)
+        return value
+    
+    def popitem(self):
+        if not self:
+            return super().popitem()
+        key = next(reversed(self))
+        return key, self.pop(key)
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            super().__setitem__(key, default)
+        return self[key]
+
+
 class DataVisualizer:
     """Class that handles creating visualizations of budget data"""
     
+    # DPI used for the smaller dashboard charts; raise figure_dpi for print quality
+    thumbnail_dpi = 72
+    
+    # zlib level for PNG output: fast encoding matters more than size here.
+    # Pillow picks the PNG row filters itself, and the Z_RLE zlib strategy was
+    # no faster while making charts with lines and grids up to 40% larger
+    png_compress_level = 1
+    
+    # Chart palette; matplotlib cycles it when there are more series than colors
+    default_colors = (
+        '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+        '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
+    )
+    
     def __init__(self, budget_manager):
         """
         Initialize the DataVisualizer with a budget manager.
@@ -25,12 +206,18 @@ class DataVisualizer:
             budget_manager: BudgetManager instance for accessing financial data
         """
         self.budget_manager = budget_manager
-        self.default_colors = [
-            '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
-            '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf'
-        ]
         self.figure_dpi = 100  # Default DPI for generated figures
         
+        # Figures reused between renders, keyed by (width, height, dpi)
+        self._figure_cache: Dict[Tuple[float, float, int], Figure] = {}
+        
+        # DPI override for saved images while rendering the dashboard
+        self._output_dpi: Optional[int] = None
+        
+        # Charts kept drawn between renders so repeat renders over the same
+        # months only update values: chart kind -> (key, figure, artists)
+        self._incremental_cache: Dict[str, Tuple[Any, Figure, Dict[str, Any]]] = {}
+        
     def _get_default_date_range(self) -> Tuple[datetime.date, datetime.date]:
         """
         Get a default date range for charts (last 6 months)
@@ -38,57 +225,169 @@ class DataVisualizer:
         Returns:
             Tuple of (start_date, end_date)
         """
-        today = datetime.date.today()
-        # Start from 6 months ago
-        month_6_ago = today.month - 6
-        year_offset = 0
-        if month_6_ago <= 0:
-            month_6_ago += 12
-            year_offset = -1
-            
-        start_date = datetime.date(today.year + year_offset, month_6_ago, 1)
-        end_date = today
-        
-        return start_date, end_date
+        return _default_date_range(datetime.date.today())
     
-    def _get_month_range(self, start_date: datetime.date, end_date: datetime.date) -> List[datetime.date]:
+    def _get_month_range(self, start_date: datetime.date, end_date: datetime.date) -> Tuple[datetime.date, ...]:
         """
-        Get a list of first days of months in the given range
+        Get the first days of months in the given range
         
         Args:
             start_date: Start date
             end_date: End date
             
         Returns:
-            List of datetime.date objects representing first day of each month
-        """
-        months = []
-        current = datetime.date(start_date.year, start_date.month, 1)  # First day of start month
-        
-        while current <= end_date:
-            months.append(current)
-            # Move to next month
-            if current.month == 12:
-                current = datetime.date(current.year + 1, 1, 1)
-            else:
-                current = datetime.date(current.year, current.month + 1, 1)
-                
-        return months
+            Cached, immutable tuple of datetime.date objects representing first day of each month
+        """
+        return _month_starts(start_date, end_date)
+    
+    def _get_monthly_totals(self, user_id: int, months: Tuple[datetime.date, ...],
+                            session=None) -> Tuple[List[float], List[float]]:
+        """
+        Get income and expense totals for each month in a month range
+        
+        Args:
+            user_id: User ID
+            months: First days of the months to total, as from _get_month_range
+            session: Optional open session to query with instead of a new one
+            
+        Returns:
+            Tuple of (income_data, expense_data) lists aligned with months
+        """
+        if not months:
+            return [], []
+        
+        # One grouped lookup covering every month in full
+        totals = self.budget_manager.get_monthly_income_expense(user_id, months[0], _months_end(months),
+                                                                session=session)
+        
+        income_data = []
+        expense_data = []
+        for month_key in _month_keys(months):
+            income_total, expense_total = totals.get(month_key, (0.0, 0.0))
+            income_data.append(income_total)
+            expense_data.append(expense_total)
+        
+        return income_data, expense_data
+    
+    def _get_category_spending(self, user_id: int, months: Tuple[datetime.date, ...],
+                               categories: Optional[List[int]] = None,
+                               session=None) -> Tuple[Dict[int, str], np.ndarray]:
+        """
+        Get monthly spending series for each category in a month range
+        
+        Args:
+            user_id: User ID
+            months: First days of the months to total, as from _get_month_range
+            categories: List of category IDs to include (defaults to all)
+            session: Optional open session to query with instead of a new one
+            
+        Returns:
+            Tuple of (category_names, spending) where category_names maps category
+            IDs to names and spending is a (categories x months) array whose rows
+            follow the order of category_names
+        """
+        db = self.budget_manager.db
+        with db.session_scope(session) as session:
+            # Get all categories or filter by provided category IDs
+            category_query = session.query(db.Category.id, db.Category.name)
+            if categories:
+                category_query = category_query.filter(db.Category.id.in_(categories))
+            category_names = dict(category_query.all())
+            
+            spending_rows = []
+            if months:
+                # Sum spending per month and category in the database, covering
+                # full months through the end of the last month
+                spending_rows = db.get_monthly_expense_sums_by_category(
+                    user_id, months[0], _months_end(months), categories, session=session)
+        
+        # Pivot the grouped rows into a preallocated category x month array
+        month_index = {month_key: i for i, month_key in enumerate(_month_keys(months))}
+        category_index = {cat_id: i for i, cat_id in enumerate(category_names)}
+        spending = np.zeros((len(category_index), len(months)), dtype=np.float64)
+        cells = [(category_index[cat_id], month_index[month_key], amount)
+                 for month_key, cat_id, amount in spending_rows
+                 if cat_id in category_index and month_key in month_index]
+        if cells:
+            # Each (category, month) cell appears once, so one scatter fills the array
+            row_idx, col_idx, amounts = zip(*cells)
+            spending[np.array(row_idx), np.array(col_idx)] = amounts
+        
+        return category_names, spending
+    
+    def _get_figure(self, width: float, height: float) -> Figure:
+        """
+        Get a blank figure of the given size, reusing one from an earlier render
+        
+        Figures use the Agg canvas directly rather than pyplot, so no global
+        figure registry is involved and they can be cleared and redrawn
+        instead of rebuilt.
+        
+        Args:
+            width: Figure width in inches
+            height: Figure height in inches
+            
+        Returns:
+            Empty matplotlib figure
+        """
+        key = (width, height, self.figure_dpi)
+        fig = self._figure_cache.get(key)
+        if fig is None:
+            fig = Figure(figsize=(width, height), dpi=self.figure_dpi)
+            FigureCanvasAgg(fig)
+            self._figure_cache[key] = fig
+        else:
+            self._reset_figure(fig)
+        return fig
+    
+    @staticmethod
+    def _reset_figure(fig: Figure) -> None:
+        """
+        Remove everything drawn on a figure so it can be reused
+        
+        Figure.clear() resets each axes before dropping it, rebuilding all of
+        its ticks only to throw them away; detaching the axes first leaves it
+        just the figure-level artists to reset.
+        
+        Args:
+            fig: Matplotlib figure
+        """
+        for ax in tuple(fig.axes):
+            fig.delaxes(ax)
+        fig.clear()
     
-    def _figure_to_bytes(self, fig: plt.Figure) -> bytes:
+    def _figure_to_buffer(self, fig: Figure, clear: bool = True) -> io.BytesIO:
         """
-        Convert a matplotlib figure to bytes
+        Render a matplotlib figure to an in-memory PNG buffer and clear it for reuse
         
         Args:
             fig: Matplotlib figure
+            clear: Whether to clear the figure afterwards; incrementally
+                updated charts keep their artists
             
         Returns:
-            Bytes representation of the figure
+            BytesIO holding the PNG, positioned at the start
         """
         buf = io.BytesIO()
-        fig.savefig(buf, format='png', dpi=self.figure_dpi)
+        fig.savefig(buf, format='png', dpi=self._output_dpi or self.figure_dpi,
+                    pil_kwargs={'compress_level': self.png_compress_level})
+        if clear:
+            self._reset_figure(fig)
         buf.seek(0)
-        return buf.getvalue()
+        return buf
+    
+    def _figure_to_bytes(self, fig: Figure, clear: bool = True) -> bytes:
+        """
+        Convert a matplotlib figure to bytes and clear it for reuse
+        
+        Args:
+            fig: Matplotlib figure
+            clear: Whether to clear the figure afterwards
+            
+        Returns:
+            Bytes representation of the figure
+        """
+        return self._figure_to_buffer(fig, clear).getvalue()
     
     def create_expense_by_category_chart(self, user_id: int,
                                      start_date: Optional[datetime.date] = None,
@@ -112,28 +411,39 @@ class DataVisualizer:
         
         # Get expenses by category
         expenses_by_category = self.budget_manager.get_expenses_by_category_summary(user_id, start_date, end_date)
+        return self._render_expense_by_category_chart(expenses_by_category, chart_type)
+    
+    def _render_expense_by_category_chart(self, expenses_by_category: Dict[str, float],
+                                          chart_type: str = 'pie') -> bytes:
+        """
+        Render the expenses by category chart from category totals.
         
+        Args:
+            expenses_by_category: Mapping of category name to amount spent
+            chart_type: Type of chart ('pie' or 'bar')
+            
+        Returns:
+            Bytes containing the chart image
+        """
         # Filter out categories with zero spending
         expenses_by_category = {k: v for k, v in expenses_by_category.items() if v > 0}
         
         if not expenses_by_category:
             # Create empty chart with message if no data
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig = self._get_figure(10, 6)
+            ax = fig.add_subplot(111)
             ax.text(0.5, 0.5, 'No expense data available for the selected period',
                     horizontalalignment='center', verticalalignment='center',
                     fontsize=14, transform=ax.transAxes)
             ax.axis('off')
         elif chart_type.lower() == 'pie':
             # Create pie chart
-            fig, ax = plt.subplots(figsize=(10, 8))
+            fig = self._get_figure(10, 8)
+            ax = fig.add_subplot(111)
             
             # Get categories and amounts
             categories = list(expenses_by_category.keys())
-            amounts = list(expenses_by_category.values())
-            
-            # Calculate percentages for labels
-            total = sum(amounts)
-            percentages = [amount / total * 100 for amount in amounts]
+            amounts = np.fromiter(expenses_by_category.values(), dtype=np.float64, count=len(categories))
             
             # Create pie chart with percentages
             wedges, texts, autotexts = ax.pie(
@@ -142,7 +452,7 @@ class DataVisualizer:
                 autopct='%1.1f%%',
                 startangle=90,
                 shadow=False,
-                colors=self.default_colors[:len(categories)],
+                colors=self.default_colors,
                 wedgeprops={'edgecolor': 'w', 'linewidth': 1}
             )
             
@@ -157,20 +467,21 @@ class DataVisualizer:
             ax.axis('equal')
             
             # Add title and legend
-            plt.title('Expenses by Category', fontsize=16, pad=20)
-            plt.legend(categories, loc='center left', bbox_to_anchor=(1, 0.5))
+            ax.set_title('Expenses by Category', fontsize=16, pad=20)
+            ax.legend(categories, loc='center left', bbox_to_anchor=(1, 0.5))
         else:  # bar chart
             # Create bar chart
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig = self._get_figure(10, 6)
+            ax = fig.add_subplot(111)
             
             # Get categories and amounts
             categories = list(expenses_by_category.keys())
-            amounts = list(expenses_by_category.values())
+            amounts = np.fromiter(expenses_by_category.values(), dtype=np.float64, count=len(categories))
             
             # Create horizontal bar chart
             y_pos = np.arange(len(categories))
-            ax.barh(y_pos, amounts, align='center', 
-                   color=self.default_colors[:len(categories)])
+            bars = ax.barh(y_pos, amounts, align='center', 
+                           color=self.default_colors)
             
             # Set labels and title
             ax.set_yticks(y_pos)
@@ -180,17 +491,18 @@ class DataVisualizer:
             ax.set_title('Expenses by Category', fontsize=16)
             
             # Add amount labels at the end of each bar
-            for i, amount in enumerate(amounts):
-                ax.text(amount + (max(amounts) * 0.01), y_pos[i], 
-                       f'${amount:.2f}', va='center')
+            ax.bar_label(bars, labels=[f'${amount:.2f}' for amount in amounts], padding=3)
         
-        # Adjust layout
-        plt.tight_layout()
+        # Adjust layout; only the pie chart, with its outside legend, needs measuring
+        if expenses_by_category and chart_type.lower() == 'pie':
+            fig.tight_layout()
+        elif expenses_by_category:
+            fig.subplots_adjust(**CHART_MARGINS['category_bar'])
+        else:
+            fig.subplots_adjust(**CHART_MARGINS['message'])
         
         # Convert to bytes
-        result = self._figure_to_bytes(fig)
-        plt.close(fig)
-        return result
+        return self._figure_to_bytes(fig)
     
     def create_income_expense_chart(self, user_id: int, 
                                   start_date: Optional[datetime.date] = None,
@@ -213,67 +525,71 @@ class DataVisualizer:
         # Get month range
         months = self._get_month_range(start_date, end_date)
         
-        # Create lists to hold data
-        income_data = []
-        expense_data = []
-        net_data = []
-        month_labels = []
-        
-        # Get data for each month
-        for month_date in months:
-            # Last day of month
-            last_day = calendar.monthrange(month_date.year, month_date.month)[1]
-            month_end = datetime.date(month_date.year, month_date.month, last_day)
-            
-            # Get income and expense totals
-            income_total = self.budget_manager.get_total_income(user_id, month_date, month_end)
-            expense_total = self.budget_manager.get_total_expense(user_id, month_date, month_end)
-            
-            # Calculate net
-            net = income_total - expense_total
-            
-            # Add to data lists
-            income_data.append(income_total)
-            expense_data.append(expense_total)
-            net_data.append(net)
+        # Get income and expense totals for every month at once
+        income_data, expense_data = self._get_monthly_totals(user_id, months)
+        return self._render_income_expense_chart(months, income_data, expense_data)
+    
+    def _render_income_expense_chart(self, months: Tuple[datetime.date, ...],
+                                     income_data: List[float], expense_data: List[float]) -> bytes:
+        """
+        Render the income vs expenses chart from monthly totals.
+        
+        Args:
+            months: First days of the charted months
+            income_data: Income total for each month
+            expense_data: Expense total for each month
             
-            # Add month label
-            month_labels.append(month_date.strftime('%b %Y'))
+        Returns:
+            Bytes containing the chart image
+        """
+        # The axes, ticks and legend only depend on the months charted, so a
+        # chart drawn for the same months is updated in place
+        key = (months, self.figure_dpi)
+        cached = self._incremental_cache.get('income_expense')
+        if cached is not None and cached[0] == key:
+            _, fig, artists = cached
+        else:
+            fig = Figure(figsize=(12, 6), dpi=self.figure_dpi)
+            FigureCanvasAgg(fig)
+            artists = self._build_income_expense_chart(fig, months)
+            self._incremental_cache['income_expense'] = (key, fig, artists)
+        
+        self._update_income_expense_chart(artists, income_data, expense_data)
+        
+        # Convert to bytes, keeping the artists for the next render
+        return self._figure_to_bytes(fig, clear=False)
+    
+    def _build_income_expense_chart(self, fig: Figure, months: Tuple[datetime.date, ...]) -> Dict[str, Any]:
+        """
+        Draw the income vs expenses chart layout with placeholder values.
         
-        # Create figure
-        fig, ax = plt.subplots(figsize=(12, 6))
+        Args:
+            fig: Empty figure to draw on
+            months: First days of the charted months
+            
+        Returns:
+            Dictionary of the artists updated on each render
+        """
+        month_labels = _month_labels(months)
+        ax = fig.add_subplot(111)
         
         # X positions
         x = np.arange(len(month_labels))
         width = 0.35
+        zeros = np.zeros(len(month_labels))
         
         # Plot income and expense bars
-        income_bars = ax.bar(x - width/2, income_data, width, label='Income', color='green')
-        expense_bars = ax.bar(x + width/2, expense_data, width, label='Expenses', color='red')
+        income_bars = ax.bar(x - width/2, zeros, width, label='Income', color='green')
+        expense_bars = ax.bar(x + width/2, zeros, width, label='Expenses', color='red')
         
         # Plot net line
-        ax.plot(x, net_data, 'bo-', label='Net', linewidth=2, markersize=6)
+        net_line, = ax.plot(x, zeros, 'bo-', label='Net', linewidth=2, markersize=6)
         
         # Add a horizontal line at y=0
         ax.axhline(y=0, color='black', linestyle='-', alpha=0.3)
         
-        # Add data labels
-        for i, income in enumerate(income_data):
-            ax.text(i - width/2, income + (max(income_data) * 0.02), 
-                   f'${income:.0f}', ha='center', va='bottom', fontsize=8)
-            
-        for i, expense in enumerate(expense_data):
-            ax.text(i + width/2, expense + (max(expense_data) * 0.02), 
-                   f'${expense:.0f}', ha='center', va='bottom', fontsize=8)
-            
-        for i, net in enumerate(net_data):
-            if net >= 0:
-                y_offset = max(income_data) * 0.05
-                va = 'bottom'
-            else:
-                y_offset = -max(income_data) * 0.05
-                va = 'top'
-            ax.text(i, net + y_offset, f'${net:.0f}', ha='center', va=va, fontsize=8)
+        # Net labels, positioned once the values are known
+        net_labels = [ax.text(i, 0, '', ha='center', fontsize=8) for i in range(len(month_labels))]
         
         # Set up axes
         ax.set_xlabel('Month', fontsize=12)
@@ -289,12 +605,60 @@ class DataVisualizer:
         ax.grid(True, linestyle='--', alpha=0.7)
         
         # Adjust layout
-        plt.tight_layout()
+        fig.subplots_adjust(**CHART_MARGINS['income_expense'])
+        
+        return {
+            'ax': ax,
+            'income_bars': income_bars,
+            'expense_bars': expense_bars,
+            'net_line': net_line,
+            'net_labels': net_labels,
+            'bar_labels': []
+        }
+    
+    def _update_income_expense_chart(self, artists: Dict[str, Any],
+                                     income_data: List[float], expense_data: List[float]) -> None:
+        """
+        Set the monthly values shown on a drawn income vs expenses chart.
         
-        # Convert to bytes
-        result = self._figure_to_bytes(fig)
-        plt.close(fig)
-        return result
+        Args:
+            artists: Artists returned by _build_income_expense_chart
+            income_data: Income total for each month
+            expense_data: Expense total for each month
+        """
+        ax = artists['ax']
+        net_data = np.subtract(income_data, expense_data, dtype=np.float64)
+        
+        for bar, income in zip(artists['income_bars'].patches, income_data):
+            bar.set_height(income)
+        for bar, expense in zip(artists['expense_bars'].patches, expense_data):
+            bar.set_height(expense)
+        artists['net_line'].set_ydata(net_data)
+        
+        # Bar labels are anchored to the old heights, so replace them
+        for label in artists['bar_labels']:
+            label.remove()
+        artists['bar_labels'] = (
+            ax.bar_label(artists['income_bars'], labels=[f'${income:.0f}' for income in income_data],
+                         padding=3, fontsize=8) +
+            ax.bar_label(artists['expense_bars'], labels=[f'${expense:.0f}' for expense in expense_data],
+                         padding=3, fontsize=8)
+        )
+        
+        # Net labels sit above positive points and below negative ones
+        above = net_data >= 0
+        net_offset = max(income_data, default=0) * 0.05
+        label_y = np.where(above, net_data + net_offset, net_data - net_offset)
+        label_va = np.where(above, 'bottom', 'top')
+        for i, (label, net, y, va) in enumerate(zip(artists['net_labels'], net_data.tolist(),
+                                                    label_y.tolist(), label_va.tolist())):
+            label.set_position((i, y))
+            label.set_text(f'${net:.0f}')
+            label.set_verticalalignment(va)
+        
+        # Rescale to the new values
+        ax.relim()
+        ax.autoscale_view()
 
     def create_monthly_savings_chart(self, user_id: int,
                                    start_date: Optional[datetime.date] = None,
@@ -317,35 +681,32 @@ class DataVisualizer:
         # Get month range
         months = self._get_month_range(start_date, end_date)
         
-        # Create lists to hold data
-        monthly_savings = []
-        cumulative_savings = 0
-        cumulative_data = []
-        month_labels = []
-        
-        # Get data for each month
-        for month_date in months:
-            # Last day of month
-            last_day = calendar.monthrange(month_date.year, month_date.month)[1]
-            month_end = datetime.date(month_date.year, month_date.month, last_day)
-            
-            # Get income and expense totals
-            income_total = self.budget_manager.get_total_income(user_id, month_date, month_end)
-            expense_total = self.budget_manager.get_total_expense(user_id, month_date, month_end)
-            
-            # Calculate monthly savings
-            month_savings = income_total - expense_total
-            monthly_savings.append(month_savings)
-            
-            # Update cumulative savings
-            cumulative_savings += month_savings
-            cumulative_data.append(cumulative_savings)
+        # Get income and expense totals for every month at once
+        income_data, expense_data = self._get_monthly_totals(user_id, months)
+        return self._render_monthly_savings_chart(months, income_data, expense_data)
+    
+    def _render_monthly_savings_chart(self, months: Tuple[datetime.date, ...],
+                                      income_data: List[float], expense_data: List[float]) -> bytes:
+        """
+        Render the monthly and cumulative savings chart from monthly totals.
+        
+        Args:
+            months: First days of the charted months
+            income_data: Income total for each month
+            expense_data: Expense total for each month
             
-            # Add month label
-            month_labels.append(month_date.strftime('%b %Y'))
+        Returns:
+            Bytes containing the chart image
+        """
+        # Calculate monthly and cumulative savings
+        monthly_savings = np.subtract(income_data, expense_data, dtype=np.float64)
+        cumulative_data = np.cumsum(monthly_savings)
+        
+        month_labels = _month_labels(months)
         
         # Create figure with two y-axes
-        fig, ax1 = plt.subplots(figsize=(10, 6))
+        fig = self._get_figure(10, 6)
+        ax1 = fig.add_subplot(111)
         
         # Set up second y-axis that shares x-axis
         ax2 = ax1.twinx()
@@ -357,27 +718,18 @@ class DataVisualizer:
         bars = ax1.bar(x, monthly_savings, width=0.6, alpha=0.7, color='green',
                        label='Monthly Savings')
         
-        # Add data labels on top of bars
-        for i, bar in enumerate(bars):
-            height = bar.get_height()
-            if height >= 0:
-                va = 'bottom'
-                offset = 3
-            else:
-                va = 'top'
-                offset = -3
-            ax1.text(bar.get_x() + bar.get_width()/2., height + offset,
-                    f"${monthly_savings[i]:.0f}", ha='center', va=va, rotation=0,
-                    fontsize=8)
+        # Add data labels on top of bars (below for negative savings)
+        ax1.bar_label(bars, labels=[f"${savings:.0f}" for savings in monthly_savings], padding=3, fontsize=8)
         
         # Plot cumulative savings as line on right axis
         ax2.plot(x, cumulative_data, 'b-', marker='o', linewidth=2,
                  label='Cumulative Savings')
         
-        # Add data labels to line
-        for i, val in enumerate(cumulative_data):
-            ax2.text(i, val + (max(cumulative_data) * 0.03), 
-                    f"${val:.0f}", ha='center', fontsize=8)
+        # Add data labels to line, offset in points like the bar labels so no
+        # data-scale padding has to be worked out
+        for i, val in enumerate(cumulative_data.tolist()):
+            ax2.annotate(f"${val:.0f}", (i, val), xytext=(0, 5), textcoords='offset points',
+                         ha='center', va='bottom', fontsize=8)
         
         # Set up axes labels and title
         ax1.set_xlabel('Month', fontsize=12)
@@ -397,17 +749,16 @@ class DataVisualizer:
         ax2.legend(loc='upper right')
         
         # Adjust layout
-        plt.tight_layout()
+        fig.subplots_adjust(**CHART_MARGINS['savings'])
         
         # Convert to bytes
-        result = self._figure_to_bytes(fig)
-        plt.close(fig)
-        return result
+        return self._figure_to_bytes(fig)
 
     def create_spending_trends_chart(self, user_id: int,
                                   start_date: Optional[datetime.date] = None,
                                   end_date: Optional[datetime.date] = None,
-                                  categories: Optional[List[int]] = None) -> bytes:
+                                  categories: Optional[List[int]] = None,
+                                  session=None) -> bytes:
         """
         Create a chart showing spending trends over time by category.
         
@@ -416,6 +767,7 @@ class DataVisualizer:
             start_date: Start date for chart, defaults to 6 months ago
             end_date: End date for chart, defaults to today
             categories: List of category IDs to include (defaults to all)
+            session: Optional open session to query with instead of a new one
             
         Returns:
             Bytes containing the chart image
@@ -427,64 +779,39 @@ class DataVisualizer:
         # Get month range
         months = self._get_month_range(start_date, end_date)
         
-        # Get all categories or filter by provided category IDs
-        session = self.budget_manager.db.get_session()
-        try:
-            if categories:
-                db_categories = session.query(self.budget_manager.db.Category).\
-                    filter(self.budget_manager.db.Category.id.in_(categories)).all()
-            else:
-                db_categories = session.query(self.budget_manager.db.Category).all()
-                
-            # Create dictionary to map category IDs to names
-            category_names = {cat.id: cat.name for cat in db_categories}
-        finally:
-            session.close()
-        
-        # Create dictionary to track spending by category over time
-        category_spending = {cat_id: [] for cat_id in category_names.keys()}
-        month_labels = []
+        # Get spending per category for each month
+        category_names, spending = self._get_category_spending(user_id, months, categories,
+                                                               session=session)
+        return self._render_spending_trends_chart(months, category_names, spending)
+    
+    def _render_spending_trends_chart(self, months: Tuple[datetime.date, ...],
+                                      category_names: Dict[int, str], spending: np.ndarray) -> bytes:
+        """
+        Render the spending trends chart from per-category monthly spending.
         
-        # Get data for each month
-        for month_date in months:
-            # Last day of month
-            last_day = calendar.monthrange(month_date.year, month_date.month)[1]
-            month_end = datetime.date(month_date.year, month_date.month, last_day)
-            
-            # Get all expenses for the month
-            session = self.budget_manager.db.get_session()
-            try:
-                expenses = session.query(self.budget_manager.db.Expense).\
-                    filter(self.budget_manager.db.Expense.user_id == user_id,
-                          self.budget_manager.db.Expense.date >= month_date,
-                          self.budget_manager.db.Expense.date <= month_end).all()
-                
-                # Group expenses by category
-                month_expenses = {cat_id: 0 for cat_id in category_names.keys()}
-                for expense in expenses:
-                    if expense.category_id in month_expenses:
-                        month_expenses[expense.category_id] += expense.amount
-                
-                # Add to spending data
-                for cat_id in category_names.keys():
-                    category_spending[cat_id].append(month_expenses[cat_id])
-            finally:
-                session.close()
+        Args:
+            months: First days of the charted months
+            category_names: Category IDs mapped to names, in row order of spending
+            spending: (categories x months) array from _get_category_spending
             
-            # Add month label
-            month_labels.append(month_date.strftime('%b %Y'))
+        Returns:
+            Bytes containing the chart image
+        """
+        month_labels = _month_labels(months)
         
         # Create figure
-        fig, ax = plt.subplots(figsize=(12, 6))
+        fig = self._get_figure(12, 6)
+        ax = fig.add_subplot(111)
         
         # X positions
         x = np.arange(len(month_labels))
         
-        # Plot spending for each category as lines
-        for i, (cat_id, spending) in enumerate(category_spending.items()):
-            ax.plot(x, spending, marker='o', linewidth=2, 
-                   label=category_names[cat_id],
-                   color=self.default_colors[i % len(self.default_colors)])
+        # Plot spending for each category as lines, one column per category
+        if category_names:
+            ax.set_prop_cycle(color=self.default_colors)
+            lines = ax.plot(x, spending.T, marker='o', linewidth=2)
+            for line, name in zip(lines, category_names.values()):
+                line.set_label(name)
         
         # Customize chart
         ax.set_title('Monthly Spending Trends by Category', fontsize=14)
@@ -498,12 +825,10 @@ class DataVisualizer:
         ax.legend(loc='upper left', bbox_to_anchor=(1, 1))
         
         # Adjust layout
-        plt.tight_layout()
+        fig.subplots_adjust(**CHART_MARGINS['spending_trends'])
         
         # Convert to bytes
-        result = self._figure_to_bytes(fig)
-        plt.close(fig)
-        return result
+        return self._figure_to_bytes(fig)
 
     def create_financial_dashboard(self, user_id: int,
                                 start_date: Optional[datetime.date] = None,
@@ -517,34 +842,43 @@ class DataVisualizer:
             end_date: End date for charts, defaults to today
             
         Returns:
-            Dictionary containing chart images and summary statistics
+            LazyDict of chart images and summary statistics; each chart is
+            rendered the first time it is read
         """
         # Get date range
         if start_date is None or end_date is None:
             start_date, end_date = self._get_default_date_range()
         
-        # Generate all charts
-        income_expense_chart = self.create_income_expense_chart(
-            user_id, start_date, end_date)
-        category_distribution_chart = self.create_expense_by_category_chart(
-            user_id, start_date, end_date)
-        savings_chart = self.create_monthly_savings_chart(
-            user_id, start_date, end_date)
-        spending_trends_chart = self.create_spending_trends_chart(
-            user_id, start_date, end_date)
+        # All dashboard lookups share one session
+        with self.budget_manager.db.session_scope() as session:
+            # The income/expense and savings charts share the same monthly totals,
+            # so load them once and render both from the result
+            months = self._get_month_range(start_date, end_date)
+            income_data, expense_data = self._get_monthly_totals(user_id, months, session=session)
+            
+            # Summary totals and the category breakdown come from one lookup as well
+            totals = self.budget_manager.get_dashboard_totals(user_id, start_date, end_date,
+                                                              session=session)
+            
+            category_names, spending = self._get_category_spending(user_id, months, session=session)
         
         # Get summary statistics
-        income_total = self.budget_manager.get_total_income(user_id, start_date, end_date)
-        expense_total = self.budget_manager.get_total_expense(user_id, start_date, end_date)
+        income_total = totals['income']
+        expense_total = totals['expense']
         net_savings = income_total - expense_total
         savings_rate = (net_savings / income_total * 100) if income_total > 0 else 0
         
-        # Create dashboard dictionary that matches test expectations
-        dashboard = {
-            'income_expense_chart': income_expense_chart,
-            'category_distribution_chart': category_distribution_chart,
-            'savings_chart': savings_chart,
-            'spending_trends_chart': spending_trends_chart,
+        # Charts are rendered from the loaded data only when read, so callers
+        # that show a subset of the dashboard skip the other renders
+        dashboard = LazyDict({
+            'income_expense_chart': lambda: self._render_thumbnail(
+                self._render_income_expense_chart, months, income_data, expense_data),
+            'category_distribution_chart': lambda: self._render_thumbnail(
+                self._render_expense_by_category_chart, totals['by_category']),
+            'savings_chart': lambda: self._render_thumbnail(
+                self._render_monthly_savings_chart, months, income_data, expense_data),
+            'spending_trends_chart': lambda: self._render_thumbnail(
+                self._render_spending_trends_chart, months, category_names, spending),
             'summary_stats': {
                 'total_income': income_total,
                 'total_expenses': expense_total,
@@ -555,32 +889,53 @@ class DataVisualizer:
                     'end_date': end_date.isoformat()
                 }
             }
-        }
+        })
         
         return dashboard
+    
+    def _render_thumbnail(self, render, *args) -> bytes:
+        """
+        Call a chart render method with output at thumbnail resolution.
+        
+        Args:
+            render: One of the _render_*_chart methods
+            *args: Data arguments for the render method
+            
+        Returns:
+            Bytes containing the chart image
+        """
+        self._output_dpi = self.thumbnail_dpi
+        try:
+            return render(*args)
+        finally:
+            self._output_dpi = None
 
-    def export_chart_to_file(self, chart_bytes: bytes, filename: str) -> bool:
+    def export_chart_to_file(self, chart_bytes: Union[bytes, io.BytesIO], filename: str) -> bool:
         """
         Export a chart to a file.
         
         Args:
-            chart_bytes: Bytes representation of the chart
+            chart_bytes: Bytes representation of the chart, or a BytesIO buffer
+                holding it (written without copying)
             filename: Path to save the file
             
         Returns:
-            True if successful, False otherwise
+            True if successful, False if the file could not be written
         """
         try:
             # Ensure directory exists
             dir_path = os.path.dirname(filename)
-            if dir_path and not os.path.exists(dir_path):
-                os.makedirs(dir_path)
+            if dir_path:
+                os.makedirs(dir_path, exist_ok=True)
                 
             # Write bytes to file
             with open(filename, 'wb') as f:
-                f.write(chart_bytes)
+                if isinstance(chart_bytes, io.BytesIO):
+                    f.write(chart_bytes.getbuffer())
+                else:
+                    f.write(chart_bytes)
                 
             return True
-        except Exception as e:
+        except OSError as e:
             print(f"Error exporting chart: {e}")
             return False
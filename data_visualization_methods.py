@@ -1,281 +0,0 @@
-"""
-Additional methods for DataVisualizer class.
-Copy and paste these methods into the data_visualization.py file to complete the implementation.
-"""
-
-def create_monthly_savings_chart(self, user_id: int,
-                               start_date: Optional[datetime.date] = None,
-                               end_date: Optional[datetime.date] = None) -> bytes:
-    """
-    Create a chart showing monthly savings and cumulative savings over time.
-    
-    Args:
-        user_id: User ID
-        start_date: Start date for chart, defaults to 6 months ago
-        end_date: End date for chart, defaults to today
-        
-    Returns:
-        Bytes containing the chart image
-    """
-    # Get date range
-    if start_date is None or end_date is None:
-        start_date, end_date = self._get_default_date_range()
-    
-    # Get month range
-    months = self._get_month_range(start_date, end_date)
-    
-    # Create lists to hold data
-    monthly_savings = []
-    cumulative_savings = 0
-    cumulative_data = []
-    month_labels = []
-    
-    # Get data for each month
-    for month_date in months:
-        # Last day of month
-        last_day = calendar.monthrange(month_date.year, month_date.month)[1]
-        month_end = datetime.date(month_date.year, month_date.month, last_day)
-        
-        # Get income and expense totals
-        income_total = self.budget_manager.get_total_income(user_id, month_date, month_end)
-        expense_total = self.budget_manager.get_total_expense(user_id, month_date, month_end)
-        
-        # Calculate monthly savings
-        month_savings = income_total - expense_total
-        monthly_savings.append(month_savings)
-        
-        # Update cumulative savings
-        cumulative_savings += month_savings
-        cumulative_data.append(cumulative_savings)
-        
-        # Add month label
-        month_labels.append(month_date.strftime('%b %Y'))
-    
-    # Create figure with two y-axes
-    fig, ax1 = plt.subplots(figsize=(10, 6))
-    
-    # Set up second y-axis that shares x-axis
-    ax2 = ax1.twinx()
-    
-    # X positions
-    x = np.arange(len(month_labels))
-    
-    # Plot monthly savings as bars on left axis
-    bars = ax1.bar(x, monthly_savings, width=0.6, alpha=0.7, color='green',
-                   label='Monthly Savings')
-    
-    # Add data labels on top of bars
-    for i, bar in enumerate(bars):
-        height = bar.get_height()
-        if height >= 0:
-            va = 'bottom'
-            offset = 3
-        else:
-            va = 'top'
-            offset = -3
-        ax1.text(bar.get_x() + bar.get_width()/2., height + offset,
-                f"${monthly_savings[i]:.0f}", ha='center', va=va, rotation=0,
-                fontsize=8)
-    
-    # Plot cumulative savings as line on right axis
-    ax2.plot(x, cumulative_data, 'b-', marker='o', linewidth=2,
-             label='Cumulative Savings')
-    
-    # Add data labels to line
-    for i, val in enumerate(cumulative_data):
-        ax2.text(i, val + (max(cumulative_data) * 0.03), 
-                f"${val:.0f}", ha='center', fontsize=8)
-    
-    # Set up axes labels and title
-    ax1.set_xlabel('Month', fontsize=12)
-    ax1.set_ylabel('Monthly Savings ($)', fontsize=12, color='green')
-    ax2.set_ylabel('Cumulative Savings ($)', fontsize=12, color='blue')
-    
-    # Set up x-ticks and grid
-    ax1.set_xticks(x)
-    ax1.set_xticklabels(month_labels, rotation=45)
-    ax1.grid(True, linestyle='--', alpha=0.7, axis='y')
-    
-    # Set title
-    ax1.set_title('Monthly and Cumulative Savings', fontsize=14)
-    
-    # Add legends
-    ax1.legend(loc='upper left')
-    ax2.legend(loc='upper right')
-    
-    # Adjust layout
-    plt.tight_layout()
-    
-    # Convert to bytes
-    result = self._figure_to_bytes(fig)
-    plt.close(fig)
-    return result
-
-def create_spending_trends_chart(self, user_id: int,
-                              start_date: Optional[datetime.date] = None,
-                              end_date: Optional[datetime.date] = None,
-                              categories: Optional[List[int]] = None) -> bytes:
-    """
-    Create a chart showing spending trends over time by category.
-    
-    Args:
-        user_id: User ID
-        start_date: Start date for chart, defaults to 6 months ago
-        end_date: End date for chart, defaults to today
-        categories: List of category IDs to include (defaults to all)
-        
-    Returns:
-        Bytes containing the chart image
-    """
-    # Get date range
-    if start_date is None or end_date is None:
-        start_date, end_date = self._get_default_date_range()
-    
-    # Get month range
-    months = self._get_month_range(start_date, end_date)
-    
-    # Get all categories or filter by provided category IDs
-    session = self.budget_manager.db.get_session()
-    try:
-        if categories:
-            db_categories = session.query(self.budget_manager.db.Category).\
-                filter(self.budget_manager.db.Category.id.in_(categories)).all()
-        else:
-            db_categories = session.query(self.budget_manager.db.Category).all()
-            
-        # Create dictionary to map category IDs to names
-        category_names = {cat.id: cat.name for cat in db_categories}
-    finally:
-        session.close()
-    
-    # Create dictionary to track spending by category over time
-    category_spending = {cat_id: [] for cat_id in category_names.keys()}
-    month_labels = []
-    
-    # Get data for each month
-    for month_date in months:
-        # Last day of month
-        last_day = calendar.monthrange(month_date.year, month_date.month)[1]
-        month_end = datetime.date(month_date.year, month_date.month, last_day)
-        
-        # Get all expenses for the month
-        session = self.budget_manager.db.get_session()
-        try:
-            expenses = session.query(self.budget_manager.db.Expense).\
-                filter(self.budget_manager.db.Expense.user_id == user_id,
-                      self.budget_manager.db.Expense.date >= month_date,
-                      self.budget_manager.db.Expense.date <= month_end).all()
-            
-            # Group expenses by category
-            month_expenses = {cat_id: 0 for cat_id in category_names.keys()}
-            for expense in expenses:
-                if expense.category_id in month_expenses:
-                    month_expenses[expense.category_id] += expense.amount
-            
-            # Add to spending data
-            for cat_id in category_names.keys():
-                category_spending[cat_id].append(month_expenses[cat_id])
-        finally:
-            session.close()
-        
-        # Add month label
-        month_labels.append(month_date.strftime('%b %Y'))
-    
-    # Create figure
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    # X positions
-    x = np.arange(len(month_labels))
-    
-    # Plot spending for each category as lines
-    for i, (cat_id, spending) in enumerate(category_spending.items()):
-        ax.plot(x, spending, marker='o', linewidth=2, 
-               label=category_names[cat_id],
-               color=self.default_colors[i % len(self.default_colors)])
-    
-    # Customize chart
-    ax.set_title('Monthly Spending Trends by Category', fontsize=14)
-    ax.set_xlabel('Month', fontsize=12)
-    ax.set_ylabel('Amount ($)', fontsize=12)
-    ax.set_xticks(x)
-    ax.set_xticklabels(month_labels, rotation=45)
-    ax.legend(loc='upper left', bbox_to_anchor=(1, 1))
-    ax.grid(True, linestyle='--', alpha=0.7)
-    
-    # Adjust layout
-    plt.tight_layout()
-    
-    # Convert to bytes
-    result = self._figure_to_bytes(fig)
-    plt.close(fig)
-    return result
-
-def create_financial_dashboard(self, user_id: int,
-                            start_date: Optional[datetime.date] = None,
-                            end_date: Optional[datetime.date] = None) -> Dict[str, Any]:
-    """
-    Create a complete financial dashboard with multiple charts.
-    
-    Args:
-        user_id: User ID
-        start_date: Start date for charts, defaults to 6 months ago
-        end_date: End date for charts, defaults to today
-        
-    Returns:
-        Dictionary containing chart images and summary statistics
-    """
-    # Get date range
-    if start_date is None or end_date is None:
-        start_date, end_date = self._get_default_date_range()
-    
-    # Calculate summary statistics
-    total_income = self.budget_manager.get_total_income(user_id, start_date, end_date)
-    total_expenses = self.budget_manager.get_total_expense(user_id, start_date, end_date)
-    net_savings = total_income - total_expenses
-    savings_rate = (net_savings / total_income * 100) if total_income > 0 else 0
-    
-    # Get expense breakdown
-    expense_by_category = self.budget_manager.get_expenses_by_category_summary(user_id, start_date, end_date)
-    
-    # Create dashboard components
-    dashboard = {
-        'income_expense_chart': self.create_income_expense_chart(user_id, start_date, end_date),
-        'category_distribution_chart': self.create_expense_by_category_chart(user_id, start_date, end_date),
-        'savings_chart': self.create_monthly_savings_chart(user_id, start_date, end_date),
-        'spending_trends_chart': self.create_spending_trends_chart(user_id, start_date, end_date),
-        'summary_stats': {
-            'total_income': total_income,
-            'total_expenses': total_expenses,
-            'net_savings': net_savings,
-            'savings_rate': savings_rate,
-            'expense_breakdown': expense_by_category,
-            'start_date': start_date.isoformat(),
-            'end_date': end_date.isoformat()
-        }
-    }
-    
-    return dashboard
-
-def export_chart_to_file(self, chart_bytes: bytes, filename: str) -> bool:
-    """
-    Export a chart to a file.
-    
-    Args:
-        chart_bytes: Bytes representation of the chart
-        filename: Path to save the file
-        
-    Returns:
-        True if successful, False otherwise
-    """
-    try:
-        # Make sure the directory exists
-        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
-        
-        # Write the file
-        with open(filename, 'wb') as f:
-            f.write(chart_bytes)
-        
-        return True
-    except Exception as e:
-        print(f"Error exporting chart to file: {e}")
-        return False
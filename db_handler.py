@@ -1,8 +1,65 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, func
 from sqlalchemy.orm import sessionmaker
+from contextlib import contextmanager
 from models import Base, User, Category, Income, Expense, Budget
 import datetime
 import hashlib
+import hmac
+import os
+
+# PRAGMAs applied once to every new SQLite connection in the pool
+SQLITE_CONNECT_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # Safe with WAL; syncs at checkpoints, not every commit
+    "PRAGMA cache_size=-65536",  # 64 MiB page cache per connection
+    "PRAGMA mmap_size=268435456",  # Read up to 256 MiB through the OS page cache
+    "PRAGMA temp_store=MEMORY",  # Sorts and temp tables stay off disk
+)
+
+# IDs per IN (...) clause in batched lookups, well under SQLite's bound parameter limit
+MAX_IN_CLAUSE_IDS = 500
+
+# scrypt cost parameters for password hashing; stored with each hash so they
+# can be raised later without breaking existing accounts
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_SALT_BYTES = 16
+SCRYPT_KEY_BYTES = 32
+
+def _hash_password(password):
+    """Hash a password with a random salt as 'scrypt$n$r$p$salt$hash' (hex fields)."""
+    salt = os.urandom(SCRYPT_SALT_BYTES)
+    key = hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P,
+                         dklen=SCRYPT_KEY_BYTES)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${key.hex()}"
+
+def _is_legacy_hash(stored_hash):
+    """Check whether a stored hash predates scrypt (bare unsalted SHA-256)."""
+    return not stored_hash.startswith('scrypt$')
+
+def _verify_password(password, stored_hash):
+    """Check a password against a stored scrypt or legacy SHA-256 hash."""
+    if _is_legacy_hash(stored_hash):
+        candidate = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(candidate, stored_hash)
+    
+    try:
+        _, n, r, p, salt, key = stored_hash.split('$')
+        candidate = hashlib.scrypt(password.encode(), salt=bytes.fromhex(salt),
+                                   n=int(n), r=int(r), p=int(p), dklen=len(key) // 2)
+    except ValueError:
+        return False
+    return hmac.compare_digest(candidate.hex(), key)
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Configure a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_CONNECT_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
 
 class DatabaseHandler:
     def __init__(self, db_path='sqlite:///budget.db'):
@@ -22,14 +79,19 @@ class DatabaseHandler:
         self.Expense = Expense
         self.Budget = Budget
         
+        # Bumped on every income or expense write, and by invalidate_caches(),
+        # so callers caching aggregates can tell when they are stale
+        self.data_version = 0
+        
         # Create engine with appropriate settings for SQLite
         if 'sqlite' in db_path:
-            # SQLite specific settings
+            # SQLite specific settings. Pooled connections to a local file stay
+            # valid, so they are reused without a liveness ping on every checkout.
             self.engine = create_engine(
                 db_path,
-                connect_args={'timeout': 30},  # SQLite timeout in seconds
-                pool_pre_ping=True  # Verify connections before using them
+                connect_args={'timeout': 30}  # SQLite timeout in seconds
             )
+            event.listen(self.engine, 'connect', _apply_sqlite_pragmas)
         else:
             # Settings for other database types
             self.engine = create_engine(
@@ -43,12 +105,19 @@ class DatabaseHandler:
         # Create all tables if they don't exist
         try:
             Base.metadata.create_all(self.engine)
+            
+            # create_all skips tables that already exist, so add any
+            # indexes missing from databases created by older versions
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(self.engine, checkfirst=True)
         except Exception as e:
             print(f"Error creating database schema: {e}")
             raise
             
-        # Create session factory
-        self.Session = sessionmaker(bind=self.engine)
+        # Create session factory; objects stay loaded after commit so reading
+        # a new row's ID does not issue another SELECT
+        self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
     
     def get_session(self):
         """Get a new session for database operations."""
@@ -58,19 +127,54 @@ class DatabaseHandler:
             print(f"Error creating database session: {e}")
             raise
     
+    def invalidate_caches(self):
+        """Mark every cached aggregate stale after the database changed outside this handler.
+        
+        Call this after replacing the database file contents, e.g. restoring a backup.
+        """
+        self.data_version += 1
+    
+    @contextmanager
+    def session_scope(self, session=None):
+        """Provide a session for a block of work, closing it when the block exits.
+        
+        If an existing session is passed it is yielded as-is and left open, so
+        callers can share one session across several lookups.
+        """
+        if session is not None:
+            yield session
+            return
+        
+        session = self.get_session()
+        try:
+            yield session
+        finally:
+            session.close()
+    
+    def _get_many(self, model, ids):
+        """Load rows of a model by primary key in batched IN queries.
+        
+        Returns a dict mapping each found ID to its row; missing IDs are left out.
+        """
+        ids = list(dict.fromkeys(ids))
+        rows = {}
+        with self.session_scope() as session:
+            for start in range(0, len(ids), MAX_IN_CLAUSE_IDS):
+                batch = ids[start:start + MAX_IN_CLAUSE_IDS]
+                for row in session.query(model).filter(model.id.in_(batch)):
+                    rows[row.id] = row
+        return rows
+    
     # User operations
     def add_user(self, username, password):
         """Add a new user to the database with hashed password."""
-        session = self.get_session()
         # Hash password for security
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        password_hash = _hash_password(password)
         
         user = User(username=username, password=password_hash)
-        session.add(user)
-        session.commit()
-        user_id = user.id
-        session.close()
-        return user_id
+        with self.get_session() as session, session.begin():
+            session.add(user)
+        return user.id
     
     def authenticate_user(self, username, password):
         """Authenticate a user with username and password.
@@ -78,15 +182,18 @@ class DatabaseHandler:
         session = None
         try:
             session = self.get_session()
-            # Hash password for comparison
-            password_hash = hashlib.sha256(password.encode()).hexdigest()
+            # Hashes are salted, so look users up by name and verify each
+            users = session.query(User).filter(User.username == username).all()
             
-            user = session.query(User).filter(
-                User.username == username,
-                User.password == password_hash
-            ).first()
+            for user in users:
+                if _verify_password(password, user.password):
+                    # Upgrade legacy SHA-256 hashes now that the password is known
+                    if _is_legacy_hash(user.password):
+                        user.password = _hash_password(password)
+                        session.commit()
+                    return user.id
             
-            return user.id if user else None
+            return None
             
         except Exception as e:
             print(f"Authentication error: {e}")
@@ -98,12 +205,10 @@ class DatabaseHandler:
         
     def create_user(self, username, email=None, password=None, name=None):
         """Create a new user in the database."""
-        session = self.get_session()
-        
         # If password is provided, hash it
         password_hash = None
         if password:
-            password_hash = hashlib.sha256(password.encode()).hexdigest()
+            password_hash = _hash_password(password)
         
         # Create user with provided data
         user = User(
@@ -113,93 +218,100 @@ class DatabaseHandler:
             name=name
         )
         
-        session.add(user)
-        session.commit()
-        user_id = user.id
-        session.close()
-        return user_id
+        with self.get_session() as session, session.begin():
+            session.add(user)
+        return user.id
     
-    def get_user(self, user_id):
+    def get_user(self, user_id, session=None):
         """Get user by ID."""
-        session = self.get_session()
-        user = session.query(User).filter(User.id == user_id).first()
-        session.close()
-        return user
+        with self.session_scope(session) as session:
+            return session.get(User, user_id)
+    
+    def get_users_many(self, user_ids):
+        """Get users by ID in one batched lookup, as a dict keyed by ID."""
+        return self._get_many(User, user_ids)
     
     # Category operations
     def add_category(self, name, description=None, category_type=None):
         """Add a new category."""
-        session = self.get_session()
         category = Category(name=name, description=description or "", category_type=category_type)
-        session.add(category)
-        session.commit()
-        category_id = category.id
-        session.close()
-        return category_id
+        with self.get_session() as session, session.begin():
+            session.add(category)
+        return category.id
         
     def create_category(self, name, description="", category_type=None):
         """Create a new category with type."""
         return self.add_category(name, description, category_type)
         
-    def get_categories(self):
+    def get_categories(self, session=None):
         """Get all categories."""
-        session = self.get_session()
-        categories = session.query(Category).all()
-        session.close()
-        return categories
+        with self.session_scope(session) as session:
+            return session.query(Category).all()
+    
+    def get_categories_many(self, category_ids):
+        """Get categories by ID in one batched lookup, as a dict keyed by ID."""
+        return self._get_many(Category, category_ids)
     
-    def get_categories_by_type(self, category_type):
+    def get_categories_by_type(self, category_type, session=None):
         """Get all categories of a specific type."""
-        session = self.get_session()
-        categories = session.query(Category).filter(Category.category_type == category_type).all()
-        session.close()
-        return categories
+        with self.session_scope(session) as session:
+            return session.query(Category).filter(Category.category_type == category_type).all()
     
     # Income operations
     def add_income(self, user_id, amount, description, date):
         """Add a new income record."""
-        session = self.get_session()
         income = Income(
             user_id=user_id,
             amount=amount,
             description=description,
             date=date
         )
-        session.add(income)
-        session.commit()
-        income_id = income.id
-        session.close()
-        return income_id
+        with self.get_session() as session, session.begin():
+            session.add(income)
+        self.data_version += 1
+        return income.id
     
-    def get_income(self, income_id):
+    def get_income(self, income_id, session=None):
         """Get income by ID."""
-        session = self.get_session()
-        income = session.query(Income).filter(Income.id == income_id).first()
-        session.close()
-        return income
+        with self.session_scope(session) as session:
+            return session.get(Income, income_id)
     
-    def get_incomes_by_user(self, user_id):
+    def get_incomes_by_user(self, user_id, session=None):
         """Get all incomes for a specific user."""
-        session = self.get_session()
-        incomes = session.query(Income).filter(Income.user_id == user_id).all()
-        session.close()
-        return incomes
+        with self.session_scope(session) as session:
+            return session.query(Income).filter(Income.user_id == user_id).all()
     
-    def get_incomes_by_date_range(self, user_id, start_date, end_date):
+    def get_incomes_by_date_range(self, user_id, start_date, end_date, session=None):
         """Get all incomes within a date range for a specific user."""
-        session = self.get_session()
-        incomes = session.query(Income).filter(
-            Income.user_id == user_id,
-            Income.date >= start_date,
-            Income.date <= end_date
-        ).all()
-        session.close()
-        return incomes
+        with self.session_scope(session) as session:
+            return session.query(Income).filter(
+                Income.user_id == user_id,
+                Income.date >= start_date,
+                Income.date <= end_date
+            ).all()
+    
+    def get_income_sum(self, user_id, start_date, end_date, session=None):
+        """Get the total income amount within a date range for a specific user."""
+        with self.session_scope(session) as session:
+            return session.query(func.coalesce(func.sum(Income.amount), 0.0)).filter(
+                Income.user_id == user_id,
+                Income.date >= start_date,
+                Income.date <= end_date
+            ).scalar()
+    
+    def get_monthly_income_sums(self, user_id, start_date, end_date, session=None):
+        """Get income totals keyed by 'YYYY-MM' for months with income in a date range."""
+        with self.session_scope(session) as session:
+            income_month = func.strftime('%Y-%m', Income.date)
+            return dict(session.query(income_month, func.sum(Income.amount)).filter(
+                Income.user_id == user_id,
+                Income.date >= start_date,
+                Income.date <= end_date
+            ).group_by(income_month).all())
     
     # Expense operations
     def add_expense(self, user_id, category_id, amount, description, date, has_apr=False, apr=0.0):
         """Add a new expense record with optional APR for debt tracking."""
-        session = self.get_session()
         expense = Expense(
             user_id=user_id,
             category_id=category_id,
@@ -209,23 +321,24 @@ class DatabaseHandler:
             has_apr=has_apr,
             apr=apr
         )
-        session.add(expense)
-        session.commit()
-        expense_id = expense.id
-        session.close()
-        return expense_id
+        with self.get_session() as session, session.begin():
+            session.add(expense)
+        self.data_version += 1
+        return expense.id
         
-    def get_expense(self, expense_id):
+    def get_expense(self, expense_id, session=None):
         """Get a specific expense by ID."""
-        session = self.get_session()
-        expense = session.query(Expense).filter(Expense.id == expense_id).first()
-        session.close()
-        return expense
+        with self.session_scope(session) as session:
+            return session.get(Expense, expense_id)
+    
+    def get_expenses_many(self, expense_ids):
+        """Get expenses by ID in one batched lookup, as a dict keyed by ID."""
+        return self._get_many(Expense, expense_ids)
         
     def update_expense(self, expense_id, amount, category_id=None, description=None, date=None, has_apr=None, apr=None):
         """Update an existing expense with provided values."""
         session = self.get_session()
-        expense = session.query(Expense).filter(Expense.id == expense_id).first()
+        expense = session.get(Expense, expense_id)
         
         if not expense:
             session.close()
@@ -248,6 +361,7 @@ class DatabaseHandler:
         try:
             session.commit()
             success = True
+            self.data_version += 1
         except Exception as e:
             session.rollback()
             success = False
@@ -255,72 +369,98 @@ class DatabaseHandler:
         session.close()
         return success
     
-    def get_expenses_by_date_range(self, user_id, start_date, end_date):
+    def get_expenses_by_date_range(self, user_id, start_date, end_date, session=None):
         """Get all expenses within a date range for a specific user."""
-        session = self.get_session()
-        expenses = session.query(Expense).filter(
-            Expense.user_id == user_id,
-            Expense.date >= start_date,
-            Expense.date <= end_date
-        ).all()
-        session.close()
-        return expenses
+        with self.session_scope(session) as session:
+            return session.query(Expense).filter(
+                Expense.user_id == user_id,
+                Expense.date >= start_date,
+                Expense.date <= end_date
+            ).all()
     
-    def get_expenses_by_category(self, user_id, category_id):
+    def get_expense_sum(self, user_id, start_date, end_date, session=None):
+        """Get the total expense amount within a date range for a specific user."""
+        with self.session_scope(session) as session:
+            return session.query(func.coalesce(func.sum(Expense.amount), 0.0)).filter(
+                Expense.user_id == user_id,
+                Expense.date >= start_date,
+                Expense.date <= end_date
+            ).scalar()
+    
+    def get_monthly_expense_sums(self, user_id, start_date, end_date, session=None):
+        """Get expense totals keyed by 'YYYY-MM' for months with expenses in a date range."""
+        with self.session_scope(session) as session:
+            expense_month = func.strftime('%Y-%m', Expense.date)
+            return dict(session.query(expense_month, func.sum(Expense.amount)).filter(
+                Expense.user_id == user_id,
+                Expense.date >= start_date,
+                Expense.date <= end_date
+            ).group_by(expense_month).all())
+    
+    def get_monthly_expense_sums_by_category(self, user_id, start_date, end_date, category_ids=None, session=None):
+        """Get expense totals per month and category within a date range.
+        
+        Returns a list of ('YYYY-MM', category_id, total) rows. Pass category_ids
+        to limit the categories, or an open session to query with.
+        """
+        with self.session_scope(session) as session:
+            expense_month = func.strftime('%Y-%m', Expense.date)
+            query = session.query(expense_month, Expense.category_id, func.sum(Expense.amount)).filter(
+                Expense.user_id == user_id,
+                Expense.date >= start_date,
+                Expense.date <= end_date
+            )
+            if category_ids:
+                query = query.filter(Expense.category_id.in_(category_ids))
+            return query.group_by(expense_month, Expense.category_id).all()
+    
+    def get_expenses_by_category(self, user_id, category_id, session=None):
         """Get all expenses for a specific category and user."""
-        session = self.get_session()
-        expenses = session.query(Expense).filter(
-            Expense.user_id == user_id,
-            Expense.category_id == category_id
-        ).all()
-        session.close()
-        return expenses
+        with self.session_scope(session) as session:
+            return session.query(Expense).filter(
+                Expense.user_id == user_id,
+                Expense.category_id == category_id
+            ).all()
     
     # Budget operations
     def set_budget(self, user_id, category_id, amount, month, year):
         """Set a budget for a specific category, month and year."""
-        session = self.get_session()
-        # Check if budget already exists
-        existing_budget = session.query(Budget).filter(
-            Budget.user_id == user_id,
-            Budget.category_id == category_id,
-            Budget.month == month,
-            Budget.year == year
-        ).first()
-        
-        if existing_budget:
-            existing_budget.amount = amount
-            budget_id = existing_budget.id
-        else:
-            budget = Budget(
-                user_id=user_id,
-                category_id=category_id,
-                amount=amount,
-                month=month,
-                year=year
-            )
-            session.add(budget)
-            session.flush()
-            budget_id = budget.id
+        with self.get_session() as session, session.begin():
+            # Check if budget already exists
+            existing_budget = session.query(Budget).filter(
+                Budget.user_id == user_id,
+                Budget.category_id == category_id,
+                Budget.month == month,
+                Budget.year == year
+            ).first()
             
-        session.commit()
-        session.close()
+            if existing_budget:
+                existing_budget.amount = amount
+                budget_id = existing_budget.id
+            else:
+                budget = Budget(
+                    user_id=user_id,
+                    category_id=category_id,
+                    amount=amount,
+                    month=month,
+                    year=year
+                )
+                session.add(budget)
+                session.flush()
+                budget_id = budget.id
+        
         return budget_id
     
-    def get_budget(self, budget_id):
+    def get_budget(self, budget_id, session=None):
         """Get budget by ID."""
-        session = self.get_session()
-        budget = session.query(Budget).filter(Budget.id == budget_id).first()
-        session.close()
-        return budget
+        with self.session_scope(session) as session:
+            return session.get(Budget, budget_id)
     
-    def get_budgets_by_month_year(self, user_id, month, year):
+    def get_budgets_by_month_year(self, user_id, month, year, session=None):
         """Get all budgets for a specific month and year."""
-        session = self.get_session()
-        budgets = session.query(Budget).filter(
-            Budget.user_id == user_id,
-            Budget.month == month,
-            Budget.year == year
-        ).all()
-        session.close()
-        return budgets
+        with self.session_scope(session) as session:
+            return session.query(Budget).filter(
+                Budget.user_id == user_id,
+                Budget.month == month,
+                Budget.year == year
+            ).all()
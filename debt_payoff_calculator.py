@@ -2,13 +2,14 @@ import pandas as pd
 import numpy as np
 import datetime
 from dateutil.relativedelta import relativedelta
-import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import io
-import copy
-import logging
-from models import Category  # Import Category model
+
+
+# Fixed subplot margins for the strategy comparison chart, so it is laid out
+# without the extra draw pass tight_layout needs to measure its text
+COMPARISON_CHART_MARGINS = {'left': 0.1, 'right': 0.97, 'top': 0.95, 'bottom': 0.06, 'hspace': 0.25}
 
 
 class DebtPayoffCalculator:
@@ -17,10 +18,62 @@ class DebtPayoffCalculator:
     def __init__(self, budget_manager):
         """Initialize the debt payoff calculator with a budget manager."""
         self.budget_manager = budget_manager
+        
+        # Loaded debts keyed by (user_id, date) and payoff plans keyed by
+        # (user_id, date, additional_payment, strategy), so comparing strategies
+        # and charting a plan reuse earlier work. Dropped whenever
+        # db.data_version moves.
+        self._debts_cache = {}
+        self._plan_cache = {}
+        self._cache_version = None
+    
+    def _check_cache_version(self):
+        """Drop cached debts and plans if any income or expense was written since."""
+        data_version = self.budget_manager.db.data_version
+        if self._cache_version != data_version:
+            self._debts_cache.clear()
+            self._plan_cache.clear()
+            self._cache_version = data_version
+    
+    def _load_debts(self, user_id, today):
+        """Load a user's debts from the last 3 months as a list of debt dicts."""
+        key = (user_id, today)
+        if key in self._debts_cache:
+            return self._debts_cache[key]
+        
+        # Get expenses from last 3 months to capture all relevant debts, with
+        # their category names joined in by the same query
+        start_date = today - relativedelta(months=3)
+        debt_rows = self.budget_manager.get_debt_details(user_id, start_date, today)
+        
+        debts = []
+        for expense_id, description, category_name, amount, apr in debt_rows:
+            # Calculate interest
+            monthly_rate = apr / 100 / 12
+            
+            # Assume minimum payment is 2% of balance or $25, whichever is higher
+            min_payment = max(amount * 0.02, 25)
+            
+            debts.append({
+                'id': expense_id,
+                'description': description,
+                'category': category_name,
+                'balance': amount,
+                'apr': apr,
+                'monthly_rate': monthly_rate,
+                'min_payment': min_payment
+            })
+        
+        self._debts_cache[key] = debts
+        return debts
     
     def calculate_payoff_plan(self, user_id, additional_payment=0.0, strategy="highest_interest"):
         """Calculate debt payoff timeline with different strategies.
         
+        Plans are cached until the next income or expense write, so callers
+        get the same DataFrame, summary and debts back for repeated requests
+        and should not modify them.
+        
         Args:
             user_id: The user ID
             additional_payment: Additional monthly payment beyond minimums
@@ -29,44 +82,30 @@ class DebtPayoffCalculator:
         Returns:
             DataFrame with payoff details, summary dict, and debts list
         """
-        # Get all debt expenses
         today = datetime.date.today()
-        # Get expenses from last 3 months to capture all relevant debts
-        start_date = today - relativedelta(months=3)
-        debt_expenses = self.budget_manager.get_debt_expenses(user_id, start_date, today)
+        self._check_cache_version()
         
-        if not debt_expenses:
-            return pd.DataFrame(), {}, []
+        key = (user_id, today, additional_payment, strategy)
+        if key not in self._plan_cache:
+            debts = self._load_debts(user_id, today)
+            self._plan_cache[key] = self._simulate_payoff(debts, additional_payment, strategy)
+        return self._plan_cache[key]
+    
+    def _simulate_payoff(self, debts, additional_payment, strategy):
+        """Run a payoff plan for loaded debts.
         
-        session = self.budget_manager.db.get_session()
+        Args:
+            debts: Debt dicts from _load_debts; they are copied, not modified
+            additional_payment: Additional monthly payment beyond minimums
+            strategy: Strategy to use - 'highest_interest', 'lowest_balance', 'snowball', 'avalanche'
         
-        debts = []
-        for expense in debt_expenses:
-            # Get category name
-            try:
-                category = session.query(Category).filter(Category.id == expense.category_id).first()
-                category_name = category.name if category else "Unknown"
-            except Exception as e:
-                logging.error(f"Error fetching category for expense {expense.id}: {str(e)}")
-                category_name = "Unknown"
-            
-            # Calculate interest
-            monthly_rate = expense.apr / 100 / 12
-            
-            # Assume minimum payment is 2% of balance or $25, whichever is higher
-            min_payment = max(expense.amount * 0.02, 25)
-            
-            debts.append({
-                'id': expense.id,
-                'description': expense.description,
-                'category': category_name,
-                'balance': expense.amount,
-                'apr': expense.apr,
-                'monthly_rate': monthly_rate,
-                'min_payment': min_payment
-            })
+        Returns:
+            DataFrame with payoff details, summary dict, and debts list
+        """
+        if not debts:
+            return pd.DataFrame(), {}, []
         
-        session.close()
+        debts = [dict(debt) for debt in debts]
         
         # Sort debts according to strategy
         if strategy == "highest_interest":
@@ -80,93 +119,115 @@ class DebtPayoffCalculator:
             # Avalanche: Pay minimum on all, then extra on highest interest
             debts = sorted(debts, key=lambda x: x['apr'], reverse=True)
         
-        # Calculate payoff timeline
-        results = []
-        remaining_debts = len(debts)
-        current_month = 0
-        total_initial_balance = sum(debt['balance'] for debt in debts)
+        # Calculate payoff timeline on arrays, one entry per debt in strategy order
+        balances = np.array([debt['balance'] for debt in debts], dtype=np.float64)
+        monthly_rates = np.array([debt['monthly_rate'] for debt in debts], dtype=np.float64)
+        min_payments = np.array([debt['min_payment'] for debt in debts], dtype=np.float64)
+        total_initial_balance = balances.sum()
         extra_payment = additional_payment
         
-        # Make a deep copy of debts for calculation
-        calculation_debts = copy.deepcopy(debts)
+        # Debts recorded with no balance are never paid on; hold them at zero so
+        # closed debts need no masking, and add their balance back into totals
+        payoff_months = np.where(balances <= 0, -1, 0)
+        closed_balance = balances[balances <= 0].sum()
+        balances[balances <= 0] = 0
+        
+        # Current payment priority; the extra payment goes to the debt at its head
+        order = np.arange(len(debts))
+        head = 0
+        reorder = True
+        
+        # Per-month interest, payment and balance of every debt, written in place
+        # by the monthly update and summed per month once the plan is done
+        max_months = 600  # Limit to 50 years (600 months)
+        interest_rows = np.zeros((max_months, len(debts)), dtype=np.float64)
+        payment_rows = np.zeros((max_months, len(debts)), dtype=np.float64)
+        balance_rows = np.zeros((max_months, len(debts)), dtype=np.float64)
+        month_remaining_debts = np.zeros(max_months, dtype=np.int64)
         
-        while remaining_debts > 0 and current_month < 600:  # Limit to 50 years (600 months)
+        remaining_debts = len(debts)
+        current_month = 0
+        while remaining_debts > 0 and current_month < max_months:
             current_month += 1
-            total_payment = 0
-            total_interest = 0
+            month_index = current_month - 1
             
-            for i, debt in enumerate(calculation_debts):
-                if debt['balance'] <= 0:
-                    continue
-                
-                # Calculate interest for this month
-                interest = debt['balance'] * debt['monthly_rate']
-                total_interest += interest
-                
-                # Determine payment for this debt
-                if i == 0 and extra_payment > 0:
-                    # Apply extra payment to first debt in list (based on strategy)
-                    payment = debt['min_payment'] + extra_payment
-                else:
-                    payment = debt['min_payment']
-                
-                # Ensure we don't overpay
-                payment = min(payment, debt['balance'] + interest)
-                
-                # Apply payment
-                debt['balance'] = debt['balance'] + interest - payment
-                total_payment += payment
-                
-                # Check if debt is paid off
-                if debt['balance'] <= 0.01:  # Allow small rounding error
-                    debt['balance'] = 0
-                    debt['payoff_month'] = current_month
+            # Interest and payments for every debt; closed debts sit at zero,
+            # so both come out as zero for them
+            interest = np.multiply(balances, monthly_rates, out=interest_rows[month_index])
+            payments = min_payments
             
-            # Recount remaining debts
-            remaining_debts = sum(1 for debt in calculation_debts if debt['balance'] > 0)
+            # Apply extra payment to the first debt in the order (based on strategy)
+            if extra_payment > 0 and balances[head] > 0:
+                payments = min_payments.copy()
+                payments[head] += extra_payment
             
-            # Reorder debts for next payment according to strategy
-            if strategy in ["highest_interest", "avalanche"]:
-                calculation_debts = sorted(calculation_debts, 
-                                           key=lambda x: (-1 if x['balance'] <= 0 else x['apr']),
-                                           reverse=True)
-            elif strategy in ["lowest_balance", "snowball"]:
-                calculation_debts = sorted(calculation_debts,
-                                           key=lambda x: (float('inf') if x['balance'] <= 0 else x['balance']))
+            # Ensure we don't overpay, then apply payments
+            due = balances + interest
+            payments = np.minimum(payments, due, out=payment_rows[month_index])
+            balances = np.subtract(due, payments, out=balance_rows[month_index])
             
-            # Calculate total remaining balance
-            total_remaining = sum(debt['balance'] for debt in calculation_debts)
+            # Close debts paid down to a small rounding error
+            open_debts = int(np.count_nonzero(balances > 0.01))
+            if open_debts < remaining_debts:
+                paid_off = (balances <= 0.01) & (payoff_months == 0)
+                balances[paid_off] = 0
+                payoff_months[paid_off] = current_month
+                reorder = True
+            remaining_debts = open_debts
+            month_remaining_debts[month_index] = remaining_debts
             
-            # Add this month to results
-            results.append({
-                'month': current_month,
-                'payment': total_payment,
-                'interest': total_interest,
-                'remaining_balance': total_remaining,
-                'remaining_debts': remaining_debts,
-                'percent_paid': (1 - total_remaining / total_initial_balance) * 100 if total_initial_balance > 0 else 100
-            })
+            # Move the head for next payment according to strategy
+            if strategy in ["highest_interest", "avalanche"]:
+                # Debts are already in APR order, which never changes, so the
+                # head just moves past debts as they close
+                while reorder and head < len(debts) and balances[head] <= 0:
+                    head += 1
+            elif strategy in ["lowest_balance", "snowball"]:
+                # Balances shift every month. The stable sort keeps ties in their
+                # current order and puts paid-off debts last, and only moves
+                # anything once a debt closes or two open balances cross
+                ranked = balances[order[:remaining_debts]]
+                if reorder or (ranked[1:] < ranked[:-1]).any():
+                    priority = np.where(balances[order] <= 0, np.inf, balances[order])
+                    order = order[np.argsort(priority, kind='stable')]
+                    head = order[0]
+            reorder = False
+        
+        month_payments = payment_rows[:current_month].sum(axis=1)
+        month_interest = interest_rows[:current_month].sum(axis=1)
+        month_remaining = balance_rows[:current_month].sum(axis=1) + closed_balance
+        if total_initial_balance > 0:
+            percent_paid = (1 - month_remaining / total_initial_balance) * 100
+        else:
+            percent_paid = np.full(current_month, 100.0)
+        
+        results = pd.DataFrame({
+            'month': np.arange(1, current_month + 1),
+            'payment': month_payments,
+            'interest': month_interest,
+            'remaining_balance': month_remaining,
+            'remaining_debts': month_remaining_debts[:current_month],
+            'percent_paid': percent_paid
+        })
         
         # Process debt data for return
         summary = {
             'total_months': current_month,
-            'total_interest_paid': sum(month['interest'] for month in results),
-            'total_amount_paid': sum(month['payment'] for month in results),
-            'original_balance': total_initial_balance,
-            'monthly_payment': sum(debt['min_payment'] for debt in debts) + additional_payment
+            'total_interest_paid': float(month_interest.sum()),
+            'total_amount_paid': float(month_payments.sum()),
+            'original_balance': float(total_initial_balance),
+            'monthly_payment': float(min_payments.sum()) + additional_payment
         }
         
-        # Add payoff order to original debts
-        for i, orig_debt in enumerate(debts):
-            for calc_debt in calculation_debts:
-                if orig_debt['id'] == calc_debt['id']:
-                    orig_debt['payoff_month'] = calc_debt.get('payoff_month', current_month)
+        # Add payoff month to original debts; debts never paid off run to the last month
+        for orig_debt, payoff_month in zip(debts, payoff_months.tolist()):
+            orig_debt['payoff_month'] = payoff_month if payoff_month > 0 else current_month
         
         # Sort debts by payoff date for display
         debts = sorted(debts, key=lambda x: x.get('payoff_month', float('inf')))
         
         # Prepare return values
-        return pd.DataFrame(results), summary, debts
+        return results, summary, debts
     
     def create_payoff_chart(self, user_id, additional_payment=0.0, strategy="highest_interest"):
         """Create a chart showing debt payoff progress over time."""
@@ -209,8 +270,7 @@ class DebtPayoffCalculator:
         
         # Save to a BytesIO object
         buf = io.BytesIO()
-        canvas = FigureCanvas(fig)
-        canvas.print_png(buf)
+        FigureCanvasAgg(fig).print_png(buf)
         buf.seek(0)
         
         return buf
@@ -279,12 +339,11 @@ class DebtPayoffCalculator:
                         textcoords="offset points",
                         ha='center', va='bottom')
         
-        fig.tight_layout()
+        fig.subplots_adjust(**COMPARISON_CHART_MARGINS)
         
         # Save to a BytesIO object
         buf = io.BytesIO()
-        canvas = FigureCanvas(fig)
-        canvas.print_png(buf)
+        FigureCanvasAgg(fig).print_png(buf)
         buf.seek(0)
         
         return buf
@@ -14,28 +14,47 @@ class DataExporter:
         self.export_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exports')
         os.makedirs(self.export_dir, exist_ok=True)
     
-    def export_income_data(self, user_id, start_date=None, end_date=None, format='csv'):
-        """Export income data to CSV or Excel"""
-        # Generate income report
-        income_df = self.budget_manager.generate_income_report(user_id, start_date, end_date)
+    def _write_report(self, df, basename, format):
+        """Write a report DataFrame to a timestamped CSV or Excel file.
         
-        if income_df.empty:
-            return None, "No income data available for the selected period."
+        Args:
+            df: Report to write
+            basename: Start of the file name, before the timestamp
+            format: 'csv' or 'excel'
+        
+        Returns:
+            Tuple of (filepath, filename), or None if the format is unsupported
+        """
+        if format not in ('csv', 'excel'):
+            return None
         
         # Create filename with timestamp
         timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
         # Use .xlsx extension for excel format
         extension = "xlsx" if format == "excel" else format
-        filename = f"income_data_{timestamp}.{extension}"
+        filename = f"{basename}_{timestamp}.{extension}"
         filepath = os.path.join(self.export_dir, filename)
         
         # Export based on format
         if format == 'csv':
-            income_df.to_csv(filepath, index=False)
-        elif format == 'excel':
-            income_df.to_excel(filepath, index=False, engine='openpyxl')
+            df.to_csv(filepath, index=False)
         else:
+            df.to_excel(filepath, index=False, engine='openpyxl')
+        
+        return filepath, filename
+    
+    def export_income_data(self, user_id, start_date=None, end_date=None, format='csv'):
+        """Export income data to CSV or Excel"""
+        # Generate income report
+        income_df = self.budget_manager.generate_income_report(user_id, start_date, end_date)
+        
+        if income_df.empty:
+            return None, "No income data available for the selected period."
+        
+        written = self._write_report(income_df, 'income_data', format)
+        if written is None:
             return None, f"Unsupported format: {format}"
+        filepath, filename = written
         
         return filepath, f"Income data exported successfully to {filename}"
     
@@ -47,20 +66,10 @@ class DataExporter:
         if expense_df.empty:
             return None, "No expense data available for the selected period."
         
-        # Create filename with timestamp
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        # Use .xlsx extension for excel format
-        extension = "xlsx" if format == "excel" else format
-        filename = f"expense_data_{timestamp}.{extension}"
-        filepath = os.path.join(self.export_dir, filename)
-        
-        # Export based on format
-        if format == 'csv':
-            expense_df.to_csv(filepath, index=False)
-        elif format == 'excel':
-            expense_df.to_excel(filepath, index=False, engine='openpyxl')
-        else:
+        written = self._write_report(expense_df, 'expense_data', format)
+        if written is None:
             return None, f"Unsupported format: {format}"
+        filepath, filename = written
         
         return filepath, f"Expense data exported successfully to {filename}"
     
@@ -77,33 +86,21 @@ class DataExporter:
         if not budget_status:
             return None, "No budget data available for the selected period."
         
-        # Convert to DataFrame
-        budget_data = []
-        for category, data in budget_status.items():
-            budget_data.append({
-                'Category': category,
-                'Budget Amount': data['budget'],
-                'Actual Spent': data['spent'],
-                'Remaining': data['remaining'],
-                'Percentage Used': data['percentage_used']
-            })
-        
-        budget_df = pd.DataFrame(budget_data)
-        
-        # Create filename with timestamp
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        # Use .xlsx extension for excel format
-        extension = "xlsx" if format == "excel" else format
-        filename = f"budget_data_{year}_{month:02d}_{timestamp}.{extension}"
-        filepath = os.path.join(self.export_dir, filename)
-        
-        # Export based on format
-        if format == 'csv':
-            budget_df.to_csv(filepath, index=False)
-        elif format == 'excel':
-            budget_df.to_excel(filepath, index=False, engine='openpyxl')
-        else:
+        # Convert to DataFrame in one step, one row per category
+        budget_columns = {
+            'budget': 'Budget Amount',
+            'spent': 'Actual Spent',
+            'remaining': 'Remaining',
+            'percentage_used': 'Percentage Used'
+        }
+        budget_df = pd.DataFrame.from_dict(budget_status, orient='index')[list(budget_columns)].\
+            rename(columns=budget_columns).\
+            reset_index(names='Category')
+        
+        written = self._write_report(budget_df, f"budget_data_{year}_{month:02d}", format)
+        if written is None:
             return None, f"Unsupported format: {format}"
+        filepath, filename = written
         
         return filepath, f"Budget data exported successfully to {filename}"
     
@@ -115,20 +112,10 @@ class DataExporter:
         if debt_df is None or debt_df.empty:
             return None, "No debt data available or debt calculator not initialized."
         
-        # Create filename with timestamp
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        # Use .xlsx extension for excel format
-        extension = "xlsx" if format == "excel" else format
-        filename = f"debt_analysis_{timestamp}.{extension}"
-        filepath = os.path.join(self.export_dir, filename)
-        
-        # Export based on format
-        if format == 'csv':
-            debt_df.to_csv(filepath, index=False)
-        elif format == 'excel':
-            debt_df.to_excel(filepath, index=False, engine='openpyxl')
-        else:
+        written = self._write_report(debt_df, 'debt_analysis', format)
+        if written is None:
             return None, f"Unsupported format: {format}"
+        filepath, filename = written
         
         return filepath, f"Debt analysis data exported successfully to {filename}"
     
@@ -140,19 +127,9 @@ class DataExporter:
         if summary_df.empty:
             return None, "No monthly summary data available."
         
-        # Create filename with timestamp
-        timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-        # Use .xlsx extension for excel format
-        extension = "xlsx" if format == "excel" else format
-        filename = f"monthly_summary_{timestamp}.{extension}"
-        filepath = os.path.join(self.export_dir, filename)
-        
-        # Export based on format
-        if format == 'csv':
-            summary_df.to_csv(filepath, index=False)
-        elif format == 'excel':
-            summary_df.to_excel(filepath, index=False, engine='openpyxl')
-        else:
+        written = self._write_report(summary_df, 'monthly_summary', format)
+        if written is None:
             return None, f"Unsupported format: {format}"
+        filepath, filename = written
         
         return filepath, f"Monthly summary exported successfully to {filename}"
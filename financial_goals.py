@@ -8,7 +8,7 @@ financial goals such as emergency funds, down payments, vacations, etc.
 import datetime
 import logging
 from typing import List, Dict, Optional, Union, Any, Tuple
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Boolean, desc
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Boolean, desc, func, case
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, joinedload
 from sqlalchemy.exc import SQLAlchemyError
@@ -479,33 +479,22 @@ class GoalTracker:
         """
         session = self.db.get_session()
         try:
-            goals = session.query(FinancialGoal).filter_by(user_id=user_id).all()
-            
-            if not goals:
-                return {
-                    'total_goals': 0,
-                    'completed_goals': 0,
-                    'total_target_amount': 0.0,
-                    'total_current_amount': 0.0,
-                    'average_progress': 0.0,
-                    'nearest_deadline': None
-                }
-            
-            # Count total and completed goals
-            total_goals = len(goals)
-            completed_goals = sum(1 for goal in goals if goal.is_completed)
-            
-            # Calculate financial totals
-            total_target_amount = sum(goal.target_amount for goal in goals)
-            total_current_amount = sum(goal.current_amount for goal in goals)
-            
-            # Calculate average progress
-            progress_values = [goal.progress_percentage for goal in goals]
-            average_progress = sum(progress_values) / len(progress_values) if progress_values else 0.0
-            
-            # Find nearest deadline for incomplete goals
-            incomplete_goals = [goal for goal in goals if not goal.is_completed]
-            nearest_deadline = min((goal.target_date for goal in incomplete_goals), default=None)
+            # Aggregate in the database rather than loading every goal;
+            # progress mirrors FinancialGoal.progress_percentage
+            progress = case(
+                (FinancialGoal.target_amount <= 0, 0.0),
+                else_=func.round(FinancialGoal.current_amount * 100.0 / FinancialGoal.target_amount, 1)
+            )
+            total_goals, completed_goals, total_target_amount, total_current_amount, \
+                average_progress, nearest_deadline = session.query(
+                    func.count(FinancialGoal.id),
+                    func.coalesce(func.sum(case((FinancialGoal.is_completed, 1), else_=0)), 0),
+                    func.coalesce(func.sum(FinancialGoal.target_amount), 0.0),
+                    func.coalesce(func.sum(FinancialGoal.current_amount), 0.0),
+                    func.coalesce(func.avg(progress), 0.0),
+                    func.min(case((FinancialGoal.is_completed, None), else_=FinancialGoal.target_date),
+                             type_=Date)
+                ).filter(FinancialGoal.user_id == user_id).one()
             
             return {
                 'total_goals': total_goals,
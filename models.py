@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Index
 from sqlalchemy.orm import declarative_base, relationship
 import datetime
 
@@ -40,6 +40,10 @@ class Income(Base):
     
     user_id = Column(Integer, ForeignKey('users.id'))
     user = relationship("User", back_populates="incomes")
+    
+    __table_args__ = (
+        Index('ix_income_user_date', 'user_id', 'date'),
+    )
 
 class Expense(Base):
     __tablename__ = 'expenses'
@@ -58,6 +62,13 @@ class Expense(Base):
     
     user = relationship("User", back_populates="expenses")
     category = relationship("Category", back_populates="expenses")
+    
+    # Reports filter by user and date range, optionally by category or debt flag
+    __table_args__ = (
+        Index('ix_expense_user_date', 'user_id', 'date'),
+        Index('ix_expense_user_cat_date', 'user_id', 'category_id', 'date'),
+        Index('ix_expense_user_hasapr_date', 'user_id', 'has_apr', 'date'),
+    )
 
 class Budget(Base):
     __tablename__ = 'budgets'
@@ -72,6 +83,10 @@ class Budget(Base):
     
     user = relationship("User", back_populates="budgets")
     category = relationship("Category", back_populates="budgets")
+    
+    __table_args__ = (
+        Index('ix_budget_user_month_year', 'user_id', 'month', 'year'),
+    )
 
 def init_db():
     """Initialize the database, creating all tables."""
@@ -0,0 +1,206 @@
+import unittest
+import datetime
+import os
+import sqlite3
+import sys
+import tempfile
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backup_utils import BackupManager
+
+
+class TestBackupManager(unittest.TestCase):
+    """Test cases for BackupManager class"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, 'budget.db')
+        self.backup_dir = os.path.join(self.temp_dir.name, 'backups')
+
+        # Create a small database with some data
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE expenses (id INTEGER PRIMARY KEY, amount REAL)")
+        conn.executemany("INSERT INTO expenses (amount) VALUES (?)", [(10.0,), (20.0,), (30.0,)])
+        conn.commit()
+        conn.close()
+
+        self.backup_manager = BackupManager(self.db_path, self.backup_dir)
+
+    def _count_expenses(self, path):
+        """Return the number of rows in the expenses table of a database"""
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM expenses").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_create_backup(self):
+        """Test creating a backup of the database"""
+        backup_path = self.backup_manager.create_backup()
+
+        # Verify backup was created with the same data
+        self.assertIsNotNone(backup_path)
+        self.assertTrue(os.path.exists(backup_path))
+        self.assertEqual(self._count_expenses(backup_path), 3)
+
+    def test_create_backup_with_progress(self):
+        """Test that backup progress is reported through the callback"""
+        progress = []
+        backup_path = self.backup_manager.create_backup(
+            progress_callback=lambda status, remaining, total: progress.append((remaining, total))
+        )
+
+        self.assertIsNotNone(backup_path)
+        self.assertEqual(self._count_expenses(backup_path), 3)
+        self.assertGreater(len(progress), 0)
+        self.assertEqual(progress[-1][0], 0)
+
+    def test_create_backup_missing_database(self):
+        """Test creating a backup when the database file does not exist"""
+        manager = BackupManager(os.path.join(self.temp_dir.name, 'missing.db'), self.backup_dir)
+        self.assertIsNone(manager.create_backup())
+
+    def test_restore_backup(self):
+        """Test restoring the database from a backup"""
+        backup_path = self.backup_manager.create_backup()
+
+        # Modify the database after the backup was taken
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("DELETE FROM expenses")
+        conn.commit()
+        conn.close()
+        self.assertEqual(self._count_expenses(self.db_path), 0)
+
+        # Restore and verify the original data is back
+        self.assertTrue(self.backup_manager.restore_backup(backup_path))
+        self.assertEqual(self._count_expenses(self.db_path), 3)
+
+        # Temporary rollback copy should be cleaned up
+        self.assertFalse(os.path.exists(f"{self.db_path}.temp"))
+
+    def test_restore_backup_rolls_back_on_failure(self):
+        """Test that a failed restore leaves the current database intact"""
+        backup_path = self.backup_manager.create_backup()
+
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("INSERT INTO expenses (amount) VALUES (40.0)")
+        conn.commit()
+        conn.close()
+
+        copy_database = self.backup_manager._copy_database
+        calls = []
+
+        def failing_copy(source, dest, progress_callback=None):
+            calls.append(source)
+            if len(calls) == 1:
+                raise sqlite3.OperationalError("simulated restore failure")
+            return copy_database(source, dest, progress_callback)
+
+        with patch.object(self.backup_manager, '_copy_database', side_effect=failing_copy):
+            self.assertFalse(self.backup_manager.restore_backup(backup_path))
+
+        # Restore attempt plus rollback from the snapshot
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self._count_expenses(self.db_path), 4)
+        self.assertFalse(os.path.exists(f"{self.db_path}.temp"))
+
+    def test_restore_invalid_backup(self):
+        """Test restoring from a file that is not a SQLite database"""
+        invalid_path = os.path.join(self.backup_dir, 'budget_backup_invalid.db')
+        with open(invalid_path, 'wb') as f:
+            f.write(b'this is not a database file at all' * 10)
+
+        self.assertFalse(self.backup_manager.restore_backup(invalid_path))
+        self.assertFalse(self.backup_manager.restore_backup(os.path.join(self.backup_dir, 'nope.db')))
+
+        # Original database is untouched
+        self.assertEqual(self._count_expenses(self.db_path), 3)
+
+    def test_copy_retries_when_database_is_locked(self):
+        """Test that a locked database copy is retried with backoff"""
+        source = MagicMock()
+        source.backup.side_effect = [sqlite3.OperationalError("database is locked"), None]
+
+        with patch('backup_utils.time.sleep') as mock_sleep:
+            self.backup_manager._copy_database(source, MagicMock())
+
+        self.assertEqual(source.backup.call_count, 2)
+        mock_sleep.assert_called_once()
+
+        # Gives up after the configured number of attempts
+        source.backup.side_effect = sqlite3.OperationalError("database is locked")
+        source.backup.reset_mock()
+        with patch('backup_utils.time.sleep'):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.backup_manager._copy_database(source, MagicMock())
+        self.assertEqual(source.backup.call_count, 3)
+
+    def _make_backup_files(self, timestamps):
+        """Create placeholder backup files for the given filename timestamps"""
+        paths = []
+        for index, timestamp in enumerate(timestamps):
+            path = os.path.join(self.backup_dir, f"budget_backup_{timestamp}.db")
+            with open(path, 'wb') as f:
+                f.write(b'x' * (index + 1))
+            paths.append(path)
+        return paths
+
+    def test_list_backups(self):
+        """Test listing available backups"""
+        self._make_backup_files(['20250101_120000', '20250102_120000'])
+
+        # Files that do not match the backup naming scheme are ignored
+        for stray_name in ['notes.txt', 'budget_backup_copy.db', 'budget_import_20250101_120000.db']:
+            with open(os.path.join(self.backup_dir, stray_name), 'w') as f:
+                f.write('ignore me')
+
+        backups = self.backup_manager.list_backups()
+
+        self.assertEqual(len(backups), 2)
+        for backup in backups:
+            self.assertTrue(backup['filename'].startswith('budget_backup_'))
+            self.assertTrue(os.path.exists(backup['path']))
+            self.assertEqual(backup['size'], os.path.getsize(backup['path']))
+
+        # Newest first, with the creation time taken from the filename
+        self.assertEqual(backups[0]['filename'], 'budget_backup_20250102_120000.db')
+        self.assertEqual(backups[0]['created'], datetime.datetime(2025, 1, 2, 12, 0, 0))
+        self.assertEqual(backups[1]['created'], datetime.datetime(2025, 1, 1, 12, 0, 0))
+
+    def test_list_backups_cache(self):
+        """Test that backup listings are cached until invalidated"""
+        self._make_backup_files(['20250101_120000'])
+        self.assertEqual(len(self.backup_manager.list_backups()), 1)
+
+        # A file added behind the manager's back is not seen while the cache is fresh
+        self._make_backup_files(['20250101_120000', '20250102_120000'])
+        self.assertEqual(len(self.backup_manager.list_backups()), 1)
+        self.assertEqual(len(self.backup_manager.list_backups(use_cache=False)), 2)
+
+        # Creating a backup invalidates the cache
+        self.backup_manager.create_backup()
+        self.assertEqual(len(self.backup_manager.list_backups()), 3)
+
+    def test_clean_old_backups(self):
+        """Test removing old backups beyond the maximum"""
+        self._make_backup_files([f"202501{day:02d}_120000" for day in range(1, 6)])
+
+        removed = self.backup_manager.clean_old_backups(max_backups=2)
+
+        self.assertEqual(removed, 3)
+        remaining = self.backup_manager.list_backups()
+        self.assertEqual([backup['filename'] for backup in remaining],
+                         ['budget_backup_20250105_120000.db', 'budget_backup_20250104_120000.db'])
+        self.assertEqual(self.backup_manager.clean_old_backups(max_backups=2), 0)
+
+    def tearDown(self):
+        """Clean up after each test"""
+        self.temp_dir.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -138,6 +138,37 @@ class TestBudgetForecaster(unittest.TestCase):
         self.assertEqual(forecast['Essentials']['Projected'], 1500.00 * 6)
         self.assertEqual(forecast['Discretionary']['Projected'], 200.00 * 6)
     
+    def test_snapshot_is_cached_across_forecasts(self):
+        """Test that forecasts share one snapshot query per month"""
+        with patch.object(self.budget_manager, 'get_total_income',
+                          wraps=self.budget_manager.get_total_income) as mock_income, \
+             patch.object(self.budget_manager, 'get_debt_balances',
+                          wraps=self.budget_manager.get_debt_balances) as mock_debts:
+            self.forecaster.forecast_monthly_cash_flow(self.test_user_id, 6)
+            self.forecaster.forecast_with_debt_payoff(self.test_user_id, 12)
+            self.forecaster.forecast_savings_goal(self.test_user_id, 10000.00)
+            self.forecaster.forecast_spending_categories(self.test_user_id, 6)
+
+            self.assertEqual(mock_income.call_count, 1)
+            self.assertEqual(mock_debts.call_count, 1)
+
+            # Clearing the cache forces a fresh read
+            self.forecaster.clear_snapshot_cache()
+            self.forecaster.forecast_monthly_cash_flow(self.test_user_id, 1)
+            self.assertEqual(mock_income.call_count, 2)
+
+    def test_snapshot_refreshed_after_new_expense(self):
+        """Test that a new expense shows up in the next forecast without clearing the cache"""
+        forecast = self.forecaster.forecast_spending_categories(self.test_user_id, 6)
+        self.assertEqual(forecast['Essentials']['Monthly'], 1500.00)
+
+        self.budget_manager.add_expense(
+            self.test_user_id, self.essentials_cat_id, 100.00, "Utilities", self.today
+        )
+
+        forecast = self.forecaster.forecast_spending_categories(self.test_user_id, 6)
+        self.assertEqual(forecast['Essentials']['Monthly'], 1600.00)
+
     def tearDown(self):
         """Clean up after each test"""
         # Close database connections
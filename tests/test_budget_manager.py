@@ -2,6 +2,7 @@ import unittest
 import datetime
 import os
 import sqlite3
+import tempfile
 import pandas as pd
 from unittest.mock import MagicMock, patch
 import sys
@@ -9,6 +10,7 @@ import sys
 # Add parent directory to path so we can import our modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from backup_utils import BackupManager
 from budget_manager import BudgetManager
 from db_handler import DatabaseHandler
 from models import User, Category, Income, Expense, Budget
@@ -142,7 +144,16 @@ class TestBudgetManager(unittest.TestCase):
         self.assertEqual(debt_expenses[0].id, debt_expense_id)
         self.assertEqual(debt_expenses[0].has_apr, True)
         self.assertEqual(debt_expenses[0].apr, 18.99)
-    
+
+        # The same debts are available as plain (amount, apr) pairs
+        debt_balances = self.budget_manager.get_debt_balances(self.test_user_id)
+        self.assertEqual([tuple(row) for row in debt_balances], [(500.00, 18.99)])
+
+        # And with the category name joined in
+        debt_details = self.budget_manager.get_debt_details(self.test_user_id, self.start_of_month, self.end_of_month)
+        self.assertEqual([tuple(row) for row in debt_details],
+                         [(debt_expense_id, 'Credit Card Payment', 'Credit Card', 500.00, 18.99)])
+
     def test_generate_debt_report(self):
         """Test generating a debt report"""
         # Add some expenses, both with and without APR
@@ -172,6 +183,223 @@ class TestBudgetManager(unittest.TestCase):
         self.assertAlmostEqual(totals['monthly_interest'].values[0], 20.0)  # (1000 * 0.12 + 500 * 0.24) / 12
         self.assertAlmostEqual(totals['annual_interest'].values[0], 240.0)  # 20 * 12
     
+    def test_generate_expense_report(self):
+        """Test generating an expense report"""
+        self.budget_manager.add_expense(
+            self.test_user_id, self.groceries_cat_id, 50.00, 'Groceries', self.today
+        )
+        self.budget_manager.add_expense(
+            self.test_user_id, self.rent_cat_id, 1200.00, 'Rent', self.today
+        )
+        
+        # Generate expense report
+        report_df = self.budget_manager.generate_expense_report(self.test_user_id)
+        
+        # Verify report format and contents
+        self.assertIsInstance(report_df, pd.DataFrame)
+        self.assertEqual(len(report_df), 2)
+        self.assertEqual(list(report_df.columns), ['date', 'amount', 'category', 'description'])
+        self.assertEqual(sorted(report_df['category']), ['Groceries', 'Rent'])
+        self.assertEqual(report_df['amount'].sum(), 1250.00)
+    
+    def test_generate_income_report(self):
+        """Test generating an income report"""
+        self.budget_manager.add_income(self.test_user_id, 3000.00, 'Salary', self.today)
+        self.budget_manager.add_income(self.test_user_id, 450.00, 'Freelance work', self.today)
+        
+        report_df = self.budget_manager.generate_income_report(self.test_user_id)
+        
+        self.assertEqual(len(report_df), 2)
+        self.assertEqual(list(report_df.columns), ['date', 'amount', 'source', 'description'])
+        self.assertEqual(sorted(report_df['description']), ['Freelance work', 'Salary'])
+        self.assertEqual(report_df['amount'].sum(), 3450.00)
+    
+    def test_get_budget_status(self):
+        """Test budget status against actual spending"""
+        self.budget_manager.set_budget(self.test_user_id, self.groceries_cat_id, 200.00,
+                                       self.today.month, self.today.year)
+        self.budget_manager.set_budget(self.test_user_id, self.rent_cat_id, 1000.00,
+                                       self.today.month, self.today.year)
+        self.budget_manager.add_expense(
+            self.test_user_id, self.groceries_cat_id, 50.00, 'Groceries', self.today
+        )
+        self.budget_manager.add_expense(
+            self.test_user_id, self.groceries_cat_id, 100.00, 'More Groceries', self.today
+        )
+        self.budget_manager.add_expense(
+            self.test_user_id, self.debt_cat_id, 300.00, 'Unbudgeted', self.today
+        )
+        
+        status = self.budget_manager.get_budget_status(self.test_user_id)
+        
+        # Only budgeted categories are reported
+        self.assertEqual(set(status.keys()), {'Groceries', 'Rent'})
+        self.assertEqual(status['Groceries']['spent'], 150.00)
+        self.assertEqual(status['Groceries']['remaining'], 50.00)
+        self.assertAlmostEqual(status['Groceries']['percentage_used'], 75.0)
+        self.assertEqual(status['Rent']['spent'], 0)
+        self.assertEqual(status['Rent']['remaining'], 1000.00)
+
+    def test_empty_reports_keep_columns(self):
+        """Test that reports with no rows still have typed columns"""
+        debt_df = self.budget_manager.generate_debt_report(self.test_user_id)
+        expense_df = self.budget_manager.generate_expense_report(self.test_user_id)
+        income_df = self.budget_manager.generate_income_report(self.test_user_id)
+
+        self.assertTrue(debt_df.empty)
+        self.assertIn('monthly_interest', debt_df.columns)
+        self.assertEqual(debt_df['amount'].dtype, 'float64')
+        self.assertEqual(list(expense_df.columns), ['date', 'amount', 'category', 'description'])
+        self.assertEqual(list(income_df.columns), ['date', 'amount', 'source', 'description'])
+
+        # Callers get their own copy, so mutating one does not leak into the next
+        debt_df['extra'] = []
+        self.assertNotIn('extra', self.budget_manager.generate_debt_report(self.test_user_id).columns)
+
+    def test_get_expenses_by_category_summary(self):
+        """Test category totals as a dict and as ordered tuples"""
+        self.budget_manager.add_expense(
+            self.test_user_id, self.groceries_cat_id, 50.00, 'Groceries', self.today
+        )
+        self.budget_manager.add_expense(
+            self.test_user_id, self.groceries_cat_id, 25.00, 'More Groceries', self.today
+        )
+        self.budget_manager.add_expense(
+            self.test_user_id, self.rent_cat_id, 1000.00, 'Rent', self.today
+        )
+
+        summary = self.budget_manager.get_expenses_by_category_summary(self.test_user_id)
+        self.assertEqual(summary, {'Groceries': 75.00, 'Rent': 1000.00})
+
+        rows = self.budget_manager.get_expenses_by_category_summary(self.test_user_id, return_tuples=True)
+        self.assertEqual(rows, [('Rent', 1000.00), ('Groceries', 75.00)])
+
+    def test_create_expense_pie_chart(self):
+        """Test rendering the expense pie chart to PNG bytes"""
+        self.budget_manager.add_expense(
+            self.test_user_id, self.groceries_cat_id, 50.00, 'Groceries', self.today
+        )
+        self.budget_manager.add_expense(
+            self.test_user_id, self.rent_cat_id, 1000.00, 'Rent', self.today
+        )
+
+        first = self.budget_manager.create_expense_pie_chart(self.test_user_id)
+        fig = self.budget_manager._pie_fig
+        second = self.budget_manager.create_expense_pie_chart(self.test_user_id)
+
+        self.assertTrue(first.getvalue().startswith(b'\x89PNG'))
+        self.assertEqual(first.getvalue(), second.getvalue())
+
+        # The figure is cleared and reused rather than rebuilt
+        self.assertIs(self.budget_manager._pie_fig, fig)
+        self.assertEqual(len(fig.axes), 1)
+
+    def test_month_range(self):
+        """Test first and last day lookup for a month"""
+        self.assertEqual(BudgetManager._month_range(2024, 2),
+                         (datetime.date(2024, 2, 1), datetime.date(2024, 2, 29)))
+        self.assertEqual(BudgetManager._month_range(2025, 2),
+                         (datetime.date(2025, 2, 1), datetime.date(2025, 2, 28)))
+        self.assertEqual(self.budget_manager._current_month_range()[0],
+                         self.today.replace(day=1))
+
+    def test_generate_monthly_summary(self):
+        """Test monthly summary totals grouped by month"""
+        last_month = self.today.replace(day=1) - datetime.timedelta(days=1)
+        self.budget_manager.add_income(self.test_user_id, 3000.00, 'Salary', self.today)
+        self.budget_manager.add_income(self.test_user_id, 2500.00, 'Salary', last_month)
+        self.budget_manager.add_expense(
+            self.test_user_id, self.groceries_cat_id, 150.00, 'Groceries', self.today
+        )
+        self.budget_manager.add_expense(
+            self.test_user_id, self.debt_cat_id, 1200.00, 'Credit Card', self.today,
+            has_apr=True, apr=12.0
+        )
+        self.budget_manager.add_expense(
+            self.test_user_id, self.rent_cat_id, 1000.00, 'Rent', last_month
+        )
+
+        summary = self.budget_manager.generate_monthly_summary(self.test_user_id, months=3)
+
+        self.assertEqual(len(summary), 3)
+        self.assertEqual(summary.iloc[-1]['Period'], self.today.strftime('%b %Y'))
+
+        current = summary.iloc[-1]
+        self.assertEqual(current['Total Income'], 3000.00)
+        self.assertEqual(current['Total Expenses'], 1350.00)
+        self.assertEqual(current['Debt Principal'], 1200.00)
+        self.assertEqual(current['Interest Paid'], 12.00)
+        self.assertEqual(current['Net Savings'], 1650.00)
+
+        previous = summary.iloc[-2]
+        self.assertEqual(previous['Month'], last_month.month)
+        self.assertEqual(previous['Total Income'], 2500.00)
+        self.assertEqual(previous['Total Expenses'], 1000.00)
+        self.assertEqual(previous['Debt Principal'], 0)
+
+        # Months without activity are still reported
+        self.assertEqual(summary.iloc[0]['Total Income'], 0)
+        self.assertEqual(summary.iloc[0]['Net Savings'], 0)
+
+    def test_monthly_totals_cached_for_closed_months(self):
+        """Test that closed-month totals are reused until income or expenses change"""
+        last_month_end = self.start_of_month - datetime.timedelta(days=1)
+        last_month_start = last_month_end.replace(day=1)
+        last_key = last_month_end.strftime('%Y-%m')
+        current_key = self.today.strftime('%Y-%m')
+
+        self.budget_manager.add_income(self.test_user_id, 2500.00, 'Salary', last_month_end)
+        self.budget_manager.add_income(self.test_user_id, 3000.00, 'Salary', self.today)
+
+        totals = self.budget_manager.get_monthly_income_expense(
+            self.test_user_id, last_month_start, self.end_of_month)
+        self.assertEqual(totals, {last_key: (2500.00, 0.0), current_key: (3000.00, 0.0)})
+
+        # The closed month comes from the cache; the current month is always queried
+        with patch.object(self.db_handler, 'get_monthly_income_sums',
+                          wraps=self.db_handler.get_monthly_income_sums) as mock_sums:
+            cached = self.budget_manager.get_monthly_income_expense(
+                self.test_user_id, last_month_start, self.end_of_month)
+        self.assertEqual(cached, totals)
+        mock_sums.assert_called_once()
+        self.assertEqual(mock_sums.call_args[0][1], self.start_of_month)
+
+        # A backdated write invalidates the cached month
+        self.budget_manager.add_expense(
+            self.test_user_id, self.rent_cat_id, 1000.00, 'Rent', last_month_start
+        )
+        totals = self.budget_manager.get_monthly_income_expense(
+            self.test_user_id, last_month_start, self.end_of_month)
+        self.assertEqual(totals[last_key], (2500.00, 1000.00))
+
+    def test_restored_backup_visible_after_invalidating_caches(self):
+        """Test that cached closed-month totals are dropped once a restore invalidates caches"""
+        last_month_end = self.start_of_month - datetime.timedelta(days=1)
+        last_month_start = last_month_end.replace(day=1)
+        last_key = last_month_end.strftime('%Y-%m')
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, 'budget.db')
+            handler = DatabaseHandler(f'sqlite:///{db_path}')
+            manager = BudgetManager(db_handler=handler)
+            backup_manager = BackupManager(db_path, os.path.join(temp_dir, 'backups'))
+
+            user_id = handler.add_user('testuser', 'password')
+            manager.add_income(user_id, 2500.00, 'Salary', last_month_end)
+            backup_path = backup_manager.create_backup()
+
+            # Cache a closed month that includes a write made after the backup
+            manager.add_income(user_id, 500.00, 'Bonus', last_month_end)
+            totals = manager.get_monthly_income_expense(user_id, last_month_start, last_month_end)
+            self.assertEqual(totals[last_key], (3000.00, 0.0))
+
+            self.assertTrue(backup_manager.restore_backup(backup_path))
+            handler.invalidate_caches()
+
+            totals = manager.get_monthly_income_expense(user_id, last_month_start, last_month_end)
+            self.assertEqual(totals[last_key], (2500.00, 0.0))
+            handler.engine.dispose()
+
     def tearDown(self):
         """Clean up after each test"""
         # Close database connections
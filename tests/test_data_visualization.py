@@ -16,7 +16,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from db_handler import DatabaseHandler
 from budget_manager import BudgetManager
-from data_visualization import DataVisualizer
+from data_visualization import DataVisualizer, _month_keys, _month_labels, _months_end
 
 class TestDataVisualization(unittest.TestCase):
     """Test cases for the DataVisualizer class"""
@@ -113,6 +113,62 @@ class TestDataVisualization(unittest.TestCase):
         self.assertIsInstance(default_chart, bytes)
         self.assertGreater(len(default_chart), 0)
     
+    def test_income_expense_chart_empty_range(self):
+        """Test that a range ending before it starts still renders a chart"""
+        chart_bytes = self.visualizer.create_income_expense_chart(
+            self.test_user_id, datetime.date(2024, 6, 1), datetime.date(2024, 1, 1)
+        )
+        self.assertIsInstance(chart_bytes, bytes)
+        self.assertGreater(len(chart_bytes), 0)
+    
+    def test_get_month_range(self):
+        """Test month start dates across a year boundary"""
+        months = self.visualizer._get_month_range(datetime.date(2024, 11, 15), datetime.date(2025, 2, 1))
+        self.assertEqual(months, (datetime.date(2024, 11, 1), datetime.date(2024, 12, 1),
+                                  datetime.date(2025, 1, 1), datetime.date(2025, 2, 1)))
+
+        # An end date before the start month gives no months
+        self.assertEqual(self.visualizer._get_month_range(datetime.date(2025, 3, 15),
+                                                          datetime.date(2025, 2, 1)), ())
+
+    def test_month_labels_shared(self):
+        """Test that month labels are formatted once per month range"""
+        months = self.visualizer._get_month_range(datetime.date(2024, 11, 15), datetime.date(2025, 2, 1))
+        labels = _month_labels(months)
+        self.assertEqual(labels, ('Nov 2024', 'Dec 2024', 'Jan 2025', 'Feb 2025'))
+        self.assertIs(_month_labels(months), labels)
+
+    def test_month_keys_and_range_end(self):
+        """Test the query keys and closing day computed for a month range"""
+        months = self.visualizer._get_month_range(datetime.date(2023, 12, 15), datetime.date(2024, 2, 1))
+        self.assertEqual(_month_keys(months), ('2023-12', '2024-01', '2024-02'))
+        self.assertEqual(_months_end(months), datetime.date(2024, 2, 29))
+
+    def test_get_monthly_totals(self):
+        """Test monthly income and expense totals aligned to a month range"""
+        months = self.visualizer._get_month_range(self.start_date, self.end_date)
+        income_data, expense_data = self.visualizer._get_monthly_totals(self.test_user_id, months)
+
+        # Three months of data plus an empty month at the end of the range
+        self.assertEqual(income_data, [2800.00, 2900.00, 3000.00, 0.0])
+        self.assertEqual(expense_data, [2490.00, 2545.00, 2600.00, 0.0])
+
+    def test_get_category_spending(self):
+        """Test monthly spending series per category"""
+        months = self.visualizer._get_month_range(self.start_date, self.end_date)
+        category_names, spending = self.visualizer._get_category_spending(
+            self.test_user_id, months, [self.essentials_cat_id, self.discretionary_cat_id]
+        )
+
+        self.assertEqual(category_names, {self.essentials_cat_id: 'Essentials',
+                                          self.discretionary_cat_id: 'Discretionary'})
+        self.assertEqual(spending.shape, (2, len(months)))
+
+        # Rows follow the order of category_names
+        rows = dict(zip(category_names, spending.tolist()))
+        self.assertEqual(rows[self.essentials_cat_id], [1480.00, 1490.00, 1500.00, 0])
+        self.assertEqual(rows[self.discretionary_cat_id], [210.00, 205.00, 200.00, 0])
+
     def test_generate_expense_by_category_chart(self):
         """Test generating an expense by category chart"""
         # Generate chart
@@ -188,6 +244,148 @@ class TestDataVisualization(unittest.TestCase):
         self.assertIn('total_expenses', dashboard['summary_stats'])
         self.assertIn('savings_rate', dashboard['summary_stats'])
     
+    def test_figures_are_reused(self):
+        """Test that charts of the same size reuse one cleared figure"""
+        first = self.visualizer.create_monthly_savings_chart(
+            self.test_user_id, self.start_date, self.end_date
+        )
+        self.assertEqual(len(self.visualizer._figure_cache), 1)
+        fig = self.visualizer._figure_cache[(10, 6, self.visualizer.figure_dpi)]
+
+        # The category bar chart has the same size and redraws the same figure
+        self.visualizer.create_expense_by_category_chart(
+            self.test_user_id, self.start_date, self.end_date, chart_type='bar'
+        )
+        self.assertIs(self.visualizer._figure_cache[(10, 6, self.visualizer.figure_dpi)], fig)
+
+        # Rendering again from a reused figure gives the same image
+        second = self.visualizer.create_monthly_savings_chart(
+            self.test_user_id, self.start_date, self.end_date
+        )
+        self.assertEqual(first, second)
+        self.assertEqual(len(fig.axes), 0)
+
+    def test_income_expense_chart_updates_in_place(self):
+        """Test that repeat income/expense renders update the drawn chart"""
+        months = self.visualizer._get_month_range(self.start_date, self.end_date)
+        self.visualizer._render_income_expense_chart(months, [100.0] * len(months), [50.0] * len(months))
+        _, fig, artists = self.visualizer._incremental_cache['income_expense']
+
+        income_data = [3000.0, 3100.0, 2900.0, 0.0]
+        expense_data = [2500.0, 3300.0, 2000.0, 100.0]
+        updated = self.visualizer._render_income_expense_chart(months, income_data, expense_data)
+
+        # Same figure and artists, redrawn with the new values
+        _, same_fig, same_artists = self.visualizer._incremental_cache['income_expense']
+        self.assertIs(same_fig, fig)
+        self.assertIs(same_artists['income_bars'], artists['income_bars'])
+        self.assertEqual([bar.get_height() for bar in artists['income_bars'].patches], income_data)
+
+        # The result matches a chart drawn from scratch
+        fresh = DataVisualizer(self.budget_manager)._render_income_expense_chart(
+            months, income_data, expense_data)
+        self.assertEqual(updated, fresh)
+
+        # A different month range starts a new chart
+        other_months = self.visualizer._get_month_range(self.start_date, self.start_date)
+        self.visualizer._render_income_expense_chart(other_months, [100.0], [50.0])
+        self.assertIsNot(self.visualizer._incremental_cache['income_expense'][1], fig)
+
+    def test_dashboard_charts_render_on_access(self):
+        """Test that dashboard charts are only rendered when read"""
+        with patch.object(self.visualizer, '_render_income_expense_chart',
+                          wraps=self.visualizer._render_income_expense_chart) as mock_render:
+            dashboard = self.visualizer.create_financial_dashboard(
+                self.test_user_id, self.start_date, self.end_date
+            )
+
+            # Summary stats are available without rendering anything
+            self.assertIn('total_income', dashboard['summary_stats'])
+            mock_render.assert_not_called()
+
+            # A chart is rendered on first read and kept afterwards
+            chart = dashboard['income_expense_chart']
+            self.assertIsInstance(chart, bytes)
+            self.assertIs(dashboard['income_expense_chart'], chart)
+            self.assertEqual(mock_render.call_count, 1)
+
+        # Reading every value renders the remaining charts
+        for key, value in dashboard.items():
+            if key != 'summary_stats':
+                self.assertIsInstance(value, bytes)
+
+    def test_dashboard_copies_hold_rendered_charts(self):
+        """Test that copying or unpacking the dashboard yields chart bytes rather than callables"""
+        for copy_dashboard in (dict, lambda d: {**d}, lambda d: d.copy()):
+            dashboard = self.visualizer.create_financial_dashboard(
+                self.test_user_id, self.start_date, self.end_date
+            )
+            copied = copy_dashboard(dashboard)
+            self.assertEqual(set(copied), set(dashboard))
+            self.assertIsInstance(copied['income_expense_chart'], bytes)
+            self.assertIn('total_income', copied['summary_stats'])
+
+        self.assertIsInstance(dashboard.pop('savings_chart'), bytes)
+        self.assertNotIn('savings_chart', dashboard)
+        self.assertNotIn('<lambda>', repr(dashboard))
+
+    def test_dashboard_charts_use_thumbnail_dpi(self):
+        """Test that dashboard charts are rendered at thumbnail resolution"""
+        def png_width(png_bytes):
+            return int.from_bytes(png_bytes[16:20], 'big')
+
+        full_size = self.visualizer.create_income_expense_chart(
+            self.test_user_id, self.start_date, self.end_date
+        )
+        dashboard = self.visualizer.create_financial_dashboard(
+            self.test_user_id, self.start_date, self.end_date
+        )
+
+        self.assertEqual(png_width(full_size), 12 * self.visualizer.figure_dpi)
+        self.assertEqual(png_width(dashboard['income_expense_chart']), 12 * self.visualizer.thumbnail_dpi)
+
+        # Standalone charts go back to full resolution afterwards
+        again = self.visualizer.create_income_expense_chart(
+            self.test_user_id, self.start_date, self.end_date
+        )
+        self.assertEqual(png_width(again), 12 * self.visualizer.figure_dpi)
+
+    def test_dashboard_loads_monthly_totals_once(self):
+        """Test that dashboard charts share one monthly totals lookup"""
+        with patch.object(self.budget_manager, 'get_monthly_income_expense',
+                          wraps=self.budget_manager.get_monthly_income_expense) as mock_totals:
+            self.visualizer.create_financial_dashboard(
+                self.test_user_id, self.start_date, self.end_date
+            )
+
+        self.assertEqual(mock_totals.call_count, 1)
+
+    def test_dashboard_shares_one_session(self):
+        """Test that dashboard lookups all run in a single database session"""
+        db = self.budget_manager.db
+        with patch.object(db, 'get_session', wraps=db.get_session) as mock_session:
+            self.visualizer.create_financial_dashboard(
+                self.test_user_id, self.start_date, self.end_date
+            )
+
+        self.assertEqual(mock_session.call_count, 1)
+
+    def test_dashboard_summary_uses_bulk_totals(self):
+        """Test that dashboard summary stats come from one totals lookup"""
+        expected_income = self.budget_manager.get_total_income(self.test_user_id, self.start_date, self.end_date)
+        expected_expense = self.budget_manager.get_total_expense(self.test_user_id, self.start_date, self.end_date)
+
+        with patch.object(self.budget_manager, 'get_total_income') as mock_income, \
+             patch.object(self.budget_manager, 'get_total_expense') as mock_expense:
+            dashboard = self.visualizer.create_financial_dashboard(
+                self.test_user_id, self.start_date, self.end_date
+            )
+
+        mock_income.assert_not_called()
+        mock_expense.assert_not_called()
+        self.assertAlmostEqual(dashboard['summary_stats']['total_income'], expected_income)
+        self.assertAlmostEqual(dashboard['summary_stats']['total_expenses'], expected_expense)
+
     def test_export_chart_to_file(self):
         """Test exporting charts to files"""
         # Create temp directory
@@ -205,7 +403,23 @@ class TestDataVisualization(unittest.TestCase):
             self.assertTrue(result)
             self.assertTrue(os.path.exists(filename))
             self.assertGreater(os.path.getsize(filename), 0)
-    
+
+            # A buffer is written out directly
+            buffer_filename = os.path.join(temp_dir, 'buffer_chart.png')
+            result = self.visualizer.export_chart_to_file(BytesIO(chart_bytes), buffer_filename)
+            self.assertTrue(result)
+            with open(buffer_filename, 'rb') as f:
+                self.assertEqual(f.read(), chart_bytes)
+
+            # Missing directories are created, existing ones reused
+            nested_filename = os.path.join(temp_dir, 'charts', 'monthly', 'chart.png')
+            self.assertTrue(self.visualizer.export_chart_to_file(chart_bytes, nested_filename))
+            self.assertTrue(self.visualizer.export_chart_to_file(chart_bytes, nested_filename))
+
+            # File system errors are reported as a failed export
+            blocked_filename = os.path.join(filename, 'chart.png')
+            self.assertFalse(self.visualizer.export_chart_to_file(chart_bytes, blocked_filename))
+
     def tearDown(self):
         """Clean up after each test"""
         plt.close('all')  # Close all figures
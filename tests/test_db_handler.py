@@ -1,8 +1,13 @@
 import unittest
 import datetime
+import hashlib
 import os
 import sqlite3
 import sys
+import tempfile
+from unittest.mock import patch
+
+from sqlalchemy import event
 
 # Add parent directory to path so we can import our modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -54,6 +59,32 @@ class TestDatabaseHandler(unittest.TestCase):
         auth_user_id = self.db_handler.authenticate_user('nonexistentuser', 'password')
         self.assertIsNone(auth_user_id)
     
+    def test_password_hashes_are_salted(self):
+        """Test that equal passwords get different salted scrypt hashes"""
+        user1_id = self.db_handler.add_user('user1', 'password')
+        user2_id = self.db_handler.add_user('user2', 'password')
+
+        hash1 = self.db_handler.get_user(user1_id).password
+        hash2 = self.db_handler.get_user(user2_id).password
+        self.assertTrue(hash1.startswith('scrypt$'))
+        self.assertNotEqual(hash1, hash2)
+
+    def test_authenticate_legacy_sha256_user(self):
+        """Test that users with unsalted SHA-256 hashes can log in and are upgraded"""
+        session = self.db_handler.get_session()
+        user = User(username='legacy', password=hashlib.sha256('password'.encode()).hexdigest())
+        session.add(user)
+        session.commit()
+        user_id = user.id
+        session.close()
+
+        self.assertIsNone(self.db_handler.authenticate_user('legacy', 'wrongpassword'))
+        self.assertEqual(self.db_handler.authenticate_user('legacy', 'password'), user_id)
+
+        # The hash was replaced with a salted one that still authenticates
+        self.assertTrue(self.db_handler.get_user(user_id).password.startswith('scrypt$'))
+        self.assertEqual(self.db_handler.authenticate_user('legacy', 'password'), user_id)
+
     def test_add_category(self):
         """Test adding a category"""
         category_id = self.db_handler.add_category('Groceries')
@@ -85,6 +116,32 @@ class TestDatabaseHandler(unittest.TestCase):
         self.assertIn('Rent', category_names)
         self.assertIn('Entertainment', category_names)
     
+    def test_readers_share_passed_session(self):
+        """Test that lookups run in a caller's session and leave it open"""
+        user_id = self.db_handler.add_user('testuser', 'password')
+        category_id = self.db_handler.add_category('Groceries')
+        
+        with self.db_handler.session_scope() as session:
+            user = self.db_handler.get_user(user_id, session=session)
+            categories = self.db_handler.get_categories(session=session)
+            
+            # Both results belong to the shared session, which is still usable
+            self.assertIn(user, session)
+            self.assertIn(categories[0], session)
+            self.assertEqual(self.db_handler.get_categories_by_type(None, session=session)[0].id, category_id)
+    
+    def test_get_categories_many(self):
+        """Test batched category lookups by ID"""
+        ids = [self.db_handler.add_category(name) for name in ['Groceries', 'Rent', 'Entertainment']]
+
+        # Batches smaller than the request still return every category
+        with patch('db_handler.MAX_IN_CLAUSE_IDS', 2):
+            categories = self.db_handler.get_categories_many(ids + [ids[0], 9999])
+
+        self.assertEqual(set(categories), set(ids))
+        self.assertEqual(categories[ids[1]].name, 'Rent')
+        self.assertEqual(self.db_handler.get_categories_many([]), {})
+
     def test_add_income(self):
         """Test adding income"""
         user_id = self.db_handler.add_user('testuser', 'password')
@@ -104,6 +161,36 @@ class TestDatabaseHandler(unittest.TestCase):
         self.assertEqual(income.description, 'Salary')
         self.assertEqual(income.date, self.today)
     
+    def test_add_income_does_not_reload_after_commit(self):
+        """Test that inserting a row returns its ID without a follow-up SELECT"""
+        user_id = self.db_handler.add_user('testuser', 'password')
+        
+        statements = []
+        
+        def record_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(self.db_handler.engine, 'before_cursor_execute', record_statement)
+        try:
+            income_id = self.db_handler.add_income(user_id, 1000.00, 'Salary', self.today)
+        finally:
+            event.remove(self.db_handler.engine, 'before_cursor_execute', record_statement)
+        
+        self.assertIsNotNone(income_id)
+        self.assertFalse([statement for statement in statements if statement.lstrip().upper().startswith('SELECT')])
+    
+    def test_set_budget_updates_existing_budget(self):
+        """Test that setting a budget twice updates the same row"""
+        user_id = self.db_handler.add_user('testuser', 'password')
+        category_id = self.db_handler.add_category('Food')
+        
+        budget_id = self.db_handler.set_budget(user_id, category_id, 300.00, 1, 2025)
+        self.assertEqual(self.db_handler.set_budget(user_id, category_id, 350.00, 1, 2025), budget_id)
+        
+        budgets = self.db_handler.get_budgets_by_month_year(user_id, 1, 2025)
+        self.assertEqual(len(budgets), 1)
+        self.assertEqual(budgets[0].amount, 350.00)
+    
     def test_add_expense_with_apr(self):
         """Test adding an expense with APR"""
         user_id = self.db_handler.add_user('testuser', 'password')
@@ -158,7 +245,69 @@ class TestDatabaseHandler(unittest.TestCase):
         
         self.assertEqual(len(expenses), 1)
         self.assertEqual(expenses[0].id, expense2_id)
-    
+
+    def test_get_income_and_expense_sums(self):
+        """Test summing incomes and expenses within a date range"""
+        user_id = self.db_handler.add_user('testuser', 'password')
+        cat_id = self.db_handler.add_category('Test Category')
+
+        self.db_handler.add_income(user_id, 1000.00, 'Salary', datetime.date(2025, 1, 15))
+        self.db_handler.add_income(user_id, 500.00, 'Bonus', datetime.date(2025, 2, 15))
+        self.db_handler.add_expense(user_id, cat_id, 100.00, 'Expense 1', datetime.date(2025, 1, 10))
+        self.db_handler.add_expense(user_id, cat_id, 250.00, 'Expense 2', datetime.date(2025, 1, 20))
+
+        start_date = datetime.date(2025, 1, 1)
+        end_date = datetime.date(2025, 1, 31)
+        self.assertEqual(self.db_handler.get_income_sum(user_id, start_date, end_date), 1000.00)
+        self.assertEqual(self.db_handler.get_expense_sum(user_id, start_date, end_date), 350.00)
+
+        # Empty ranges sum to zero rather than None
+        start_date = datetime.date(2024, 1, 1)
+        end_date = datetime.date(2024, 12, 31)
+        self.assertEqual(self.db_handler.get_income_sum(user_id, start_date, end_date), 0)
+        self.assertEqual(self.db_handler.get_expense_sum(user_id, start_date, end_date), 0)
+
+    def test_get_monthly_income_and_expense_sums(self):
+        """Test income and expense totals grouped by month"""
+        user_id = self.db_handler.add_user('testuser', 'password')
+        cat_id = self.db_handler.add_category('Test Category')
+
+        self.db_handler.add_income(user_id, 1000.00, 'Salary', datetime.date(2025, 1, 15))
+        self.db_handler.add_income(user_id, 200.00, 'Bonus', datetime.date(2025, 1, 20))
+        self.db_handler.add_income(user_id, 1000.00, 'Salary', datetime.date(2025, 3, 15))
+        self.db_handler.add_expense(user_id, cat_id, 100.00, 'Expense 1', datetime.date(2025, 2, 10))
+        self.db_handler.add_expense(user_id, cat_id, 250.00, 'Expense 2', datetime.date(2025, 2, 20))
+
+        start_date = datetime.date(2025, 1, 1)
+        end_date = datetime.date(2025, 2, 28)
+        self.assertEqual(self.db_handler.get_monthly_income_sums(user_id, start_date, end_date),
+                         {'2025-01': 1200.00})
+        self.assertEqual(self.db_handler.get_monthly_expense_sums(user_id, start_date, end_date),
+                         {'2025-02': 350.00})
+
+    def test_get_monthly_expense_sums_by_category(self):
+        """Test expense totals grouped by month and category"""
+        user_id = self.db_handler.add_user('testuser', 'password')
+        cat1_id = self.db_handler.add_category('Groceries')
+        cat2_id = self.db_handler.add_category('Rent')
+
+        self.db_handler.add_expense(user_id, cat1_id, 100.00, 'Groceries', datetime.date(2025, 1, 5))
+        self.db_handler.add_expense(user_id, cat1_id, 50.00, 'More Groceries', datetime.date(2025, 1, 25))
+        self.db_handler.add_expense(user_id, cat2_id, 1000.00, 'Rent', datetime.date(2025, 1, 1))
+        self.db_handler.add_expense(user_id, cat1_id, 80.00, 'Groceries', datetime.date(2025, 2, 10))
+        self.db_handler.add_expense(user_id, cat1_id, 999.00, 'Outside range', datetime.date(2025, 3, 1))
+
+        start_date = datetime.date(2025, 1, 1)
+        end_date = datetime.date(2025, 2, 28)
+        rows = self.db_handler.get_monthly_expense_sums_by_category(user_id, start_date, end_date)
+        self.assertEqual(sorted(rows), sorted([('2025-01', cat1_id, 150.00),
+                                               ('2025-01', cat2_id, 1000.00),
+                                               ('2025-02', cat1_id, 80.00)]))
+
+        # Limited to selected categories
+        rows = self.db_handler.get_monthly_expense_sums_by_category(user_id, start_date, end_date, [cat2_id])
+        self.assertEqual(rows, [('2025-01', cat2_id, 1000.00)])
+
     def test_get_expenses_by_category(self):
         """Test getting expenses by category"""
         user_id = self.db_handler.add_user('testuser', 'password')
@@ -179,6 +328,71 @@ class TestDatabaseHandler(unittest.TestCase):
         self.assertIn(expense2_id, expense_ids)
         self.assertNotIn(expense3_id, expense_ids)
     
+    def test_file_database_uses_wal(self):
+        """Test that file-based SQLite databases get WAL mode and the connect-time PRAGMAs"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, 'budget.db')
+            handler = DatabaseHandler(f'sqlite:///{db_path}')
+            handler.add_user('testuser', 'password')
+            
+            # Per-connection settings apply to pooled connections
+            with handler.engine.connect() as connection:
+                self.assertEqual(connection.exec_driver_sql("PRAGMA synchronous").scalar(), 1)  # NORMAL
+                self.assertEqual(connection.exec_driver_sql("PRAGMA temp_store").scalar(), 2)  # MEMORY
+            handler.engine.dispose()
+            
+            conn = sqlite3.connect(db_path)
+            try:
+                journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            finally:
+                conn.close()
+            
+            self.assertEqual(journal_mode, 'wal')
+
+    def test_report_indexes_added_to_existing_database(self):
+        """Test that report indexes are created on databases that predate them"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, 'budget.db')
+            handler = DatabaseHandler(f'sqlite:///{db_path}')
+            handler.engine.dispose()
+
+            # Simulate a database created before the indexes existed
+            conn = sqlite3.connect(db_path)
+            conn.execute("DROP INDEX ix_expense_user_date")
+            conn.commit()
+            conn.close()
+
+            handler = DatabaseHandler(f'sqlite:///{db_path}')
+            handler.engine.dispose()
+
+            conn = sqlite3.connect(db_path)
+            try:
+                index_names = {row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'")}
+            finally:
+                conn.close()
+
+            for name in ['ix_expense_user_date', 'ix_expense_user_cat_date',
+                         'ix_expense_user_hasapr_date', 'ix_income_user_date',
+                         'ix_budget_user_month_year']:
+                self.assertIn(name, index_names)
+
+    def test_hot_queries_use_indexes(self):
+        """Test that user-scoped date and category filters are served by indexes"""
+        queries = {
+            "SELECT * FROM expenses WHERE user_id = 1 AND date >= '2025-01-01' AND date <= '2025-01-31'":
+                'ix_expense_user_date',
+            "SELECT * FROM incomes WHERE user_id = 1 AND date >= '2025-01-01' AND date <= '2025-01-31'":
+                'ix_income_user_date',
+            "SELECT * FROM expenses WHERE user_id = 1 AND category_id = 1":
+                'ix_expense_user_cat_date',
+        }
+
+        with self.db_handler.engine.connect() as connection:
+            for query, index_name in queries.items():
+                plan = ' '.join(row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {query}"))
+                self.assertIn(f'USING INDEX {index_name}', plan)
+
     def tearDown(self):
         """Clean up after each test"""
         # Close database connections
@@ -0,0 +1,113 @@
+import unittest
+import datetime
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from budget_manager import BudgetManager
+from db_handler import DatabaseHandler
+from debt_payoff_calculator import DebtPayoffCalculator
+
+
+class TestDebtPayoffCalculator(unittest.TestCase):
+    """Test cases for DebtPayoffCalculator class"""
+
+    def setUp(self):
+        """Set up test environment before each test"""
+        # Create in-memory database for testing
+        self.db_handler = DatabaseHandler(':memory:')
+        self.budget_manager = BudgetManager(db_handler=self.db_handler)
+        self.calculator = DebtPayoffCalculator(self.budget_manager)
+
+        self.test_user_id = self.db_handler.add_user('testuser', 'password')
+        self.card_cat_id = self.db_handler.add_category('Credit Card')
+        self.today = datetime.date.today()
+
+    def _add_debt(self, amount, apr, description='Debt'):
+        """Add an APR-bearing expense for the test user"""
+        return self.budget_manager.add_expense(
+            self.test_user_id, self.card_cat_id, amount, description, self.today, has_apr=1, apr=apr
+        )
+
+    def test_no_debts(self):
+        """Test that a user without debts gets an empty plan"""
+        results_df, summary, debts = self.calculator.calculate_payoff_plan(self.test_user_id)
+
+        self.assertTrue(results_df.empty)
+        self.assertEqual(summary, {})
+        self.assertEqual(debts, [])
+
+    def test_extra_payment_follows_strategy(self):
+        """Test that the extra payment goes to the strategy's first debt, then rolls over"""
+        large_id = self._add_debt(1000.00, 0.0, 'Large card')
+        small_id = self._add_debt(500.00, 0.0, 'Small card')
+
+        # Equal APRs keep the original order, so the large card is paid first:
+        # 125/month clears it in month 8, leaving 300 on the small card for 3 months
+        results_df, summary, debts = self.calculator.calculate_payoff_plan(
+            self.test_user_id, 100.0, 'avalanche')
+        payoff_months = {debt['id']: debt['payoff_month'] for debt in debts}
+        self.assertEqual(payoff_months, {large_id: 8, small_id: 11})
+        self.assertEqual(summary['total_months'], 11)
+        self.assertAlmostEqual(summary['total_amount_paid'], 1500.00)
+        self.assertAlmostEqual(summary['total_interest_paid'], 0.0)
+        self.assertEqual(list(results_df['remaining_debts'][7:9]), [1, 1])
+        self.assertAlmostEqual(results_df['percent_paid'].iloc[-1], 100.0)
+
+        # Snowball clears the small card first, in month 4, and the large one in month 12
+        _, summary, debts = self.calculator.calculate_payoff_plan(self.test_user_id, 100.0, 'snowball')
+        self.assertEqual([(debt['id'], debt['payoff_month']) for debt in debts],
+                         [(small_id, 4), (large_id, 12)])
+        self.assertEqual(summary['total_months'], 12)
+
+    def test_interest_accrues_monthly(self):
+        """Test monthly interest on a single debt"""
+        self._add_debt(1000.00, 12.0)
+
+        results_df, summary, _ = self.calculator.calculate_payoff_plan(self.test_user_id, 75.0)
+
+        # 1% a month on the opening balance, then 100/month comes off
+        self.assertAlmostEqual(results_df['interest'].iloc[0], 10.00)
+        self.assertAlmostEqual(results_df['remaining_balance'].iloc[0], 910.00)
+        self.assertAlmostEqual(summary['total_amount_paid'] - summary['total_interest_paid'], 1000.00)
+        self.assertEqual(results_df['remaining_balance'].iloc[-1], 0)
+        self.assertEqual(summary['monthly_payment'], 100.0)
+
+    def test_unpayable_debt_stops_at_limit(self):
+        """Test that a debt outgrowing its minimum payment stops at 50 years"""
+        debt_id = self._add_debt(50000.00, 30.0)
+
+        results_df, summary, debts = self.calculator.calculate_payoff_plan(self.test_user_id)
+
+        self.assertEqual(summary['total_months'], 600)
+        self.assertEqual(len(results_df), 600)
+        self.assertEqual(debts[0]['id'], debt_id)
+        self.assertEqual(debts[0]['payoff_month'], 600)
+        self.assertGreater(results_df['remaining_balance'].iloc[-1], 50000.00)
+
+    def test_plans_cached_until_expenses_change(self):
+        """Test that repeated plans and strategy comparisons reuse loaded debts"""
+        self._add_debt(1000.00, 18.0)
+
+        with patch.object(self.budget_manager, 'get_debt_details',
+                          wraps=self.budget_manager.get_debt_details) as mock_get_debts:
+            plan = self.calculator.calculate_payoff_plan(self.test_user_id, 50.0, 'avalanche')
+            self.assertIs(self.calculator.calculate_payoff_plan(self.test_user_id, 50.0, 'avalanche'), plan)
+            strategy_results = self.calculator.compare_strategies(self.test_user_id, 50.0)
+            self.assertEqual(mock_get_debts.call_count, 1)
+
+            # Another expense makes the next plan reload the debts
+            self._add_debt(400.00, 24.0)
+            _, summary, debts = self.calculator.calculate_payoff_plan(self.test_user_id, 50.0, 'avalanche')
+            self.assertEqual(mock_get_debts.call_count, 2)
+
+        self.assertEqual(len(strategy_results), 4)
+        self.assertEqual(len(debts), 2)
+        self.assertEqual(summary['original_balance'], 1400.00)
+
+
+if __name__ == '__main__':
+    unittest.main()
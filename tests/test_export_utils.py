@@ -122,9 +122,12 @@ class TestDataExporter(unittest.TestCase):
         # Verify file contents
         exported_df = pd.read_csv(filepath)
         self.assertEqual(len(exported_df), 2)
+        self.assertEqual(list(exported_df.columns),
+                         ['Category', 'Budget Amount', 'Actual Spent', 'Remaining', 'Percentage Used'])
         categories = exported_df['Category'].tolist()
         self.assertIn('Food', categories)
         self.assertIn('Housing', categories)
+        self.assertEqual(exported_df['Actual Spent'].tolist(), [150.00, 1200.00])
     
     def test_export_debt_data_csv(self):
         """Test exporting debt data to CSV"""
@@ -168,6 +168,31 @@ class TestFinancialGoals(unittest.TestCase):
         goal = self.goal_tracker.get_goal(goal_id)
         self.assertIsNone(goal)
     
+    def test_get_goal_summary_stats(self):
+        """Test goal summary statistics aggregated for a user"""
+        # No goals yet
+        stats = self.goal_tracker.get_goal_summary_stats(self.test_user_id)
+        self.assertEqual(stats['total_goals'], 0)
+        self.assertEqual(stats['average_progress'], 0.0)
+        self.assertIsNone(stats['nearest_deadline'])
+        
+        near_date = self.today + datetime.timedelta(days=30)
+        fund_id = self.goal_tracker.create_goal(self.test_user_id, "Emergency Fund", 1000.00, self.future_date)
+        car_id = self.goal_tracker.create_goal(self.test_user_id, "Car", 3000.00, near_date)
+        self.goal_tracker.create_goal(self.test_user_id, "Vacation", 500.00, self.future_date)
+        self.goal_tracker.update_goal_progress(fund_id, 250.00)
+        self.goal_tracker.update_goal_progress(car_id, 3000.00)
+        
+        stats = self.goal_tracker.get_goal_summary_stats(self.test_user_id)
+        self.assertEqual(stats['total_goals'], 3)
+        self.assertEqual(stats['completed_goals'], 1)
+        self.assertEqual(stats['total_target_amount'], 4500.00)
+        self.assertEqual(stats['total_current_amount'], 3250.00)
+        self.assertAlmostEqual(stats['average_progress'], (25.0 + 100.0 + 0.0) / 3)
+        
+        # The completed goal's earlier deadline is skipped
+        self.assertEqual(stats['nearest_deadline'], self.future_date)
+        
     def tearDown(self):
         """Clean up after each test"""
         session = self.db_handler.get_session()
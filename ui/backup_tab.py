@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                           QPushButton, QListWidget, QListWidgetItem, QMessageBox,
-                          QFileDialog, QFrame, QGroupBox, QSizePolicy, QProgressBar)
+                          QFileDialog, QFrame, QGroupBox, QSizePolicy, QProgressBar,
+                          QApplication)
 from PyQt5.QtCore import Qt, QDateTime, QTimer
 from PyQt5.QtGui import QFont, QIcon
 
@@ -62,28 +63,28 @@ class BackupTab(QWidget):
         backup_layout.addWidget(self.progress_bar)
         
         # Create backup button
-        backup_btn = QPushButton("Create New Backup")
-        backup_btn.setIcon(QIcon.fromTheme("document-save"))
-        backup_btn.clicked.connect(self.create_backup)
-        backup_layout.addWidget(backup_btn)
+        self.backup_btn = QPushButton("Create New Backup")
+        self.backup_btn.setIcon(QIcon.fromTheme("document-save"))
+        self.backup_btn.clicked.connect(self.create_backup)
+        backup_layout.addWidget(self.backup_btn)
         
         # Export backup button
-        export_btn = QPushButton("Export Backup to File")
-        export_btn.setIcon(QIcon.fromTheme("document-save-as"))
-        export_btn.clicked.connect(self.export_backup)
-        backup_layout.addWidget(export_btn)
+        self.export_btn = QPushButton("Export Backup to File")
+        self.export_btn.setIcon(QIcon.fromTheme("document-save-as"))
+        self.export_btn.clicked.connect(self.export_backup)
+        backup_layout.addWidget(self.export_btn)
         
         # Import backup button
-        import_btn = QPushButton("Import Backup from File")
-        import_btn.setIcon(QIcon.fromTheme("document-open"))
-        import_btn.clicked.connect(self.import_backup)
-        backup_layout.addWidget(import_btn)
+        self.import_btn = QPushButton("Import Backup from File")
+        self.import_btn.setIcon(QIcon.fromTheme("document-open"))
+        self.import_btn.clicked.connect(self.import_backup)
+        backup_layout.addWidget(self.import_btn)
         
         # Clean old backups button
-        clean_btn = QPushButton("Clean Old Backups")
-        clean_btn.setIcon(QIcon.fromTheme("edit-clear"))
-        clean_btn.clicked.connect(self.clean_backups)
-        backup_layout.addWidget(clean_btn)
+        self.clean_btn = QPushButton("Clean Old Backups")
+        self.clean_btn.setIcon(QIcon.fromTheme("edit-clear"))
+        self.clean_btn.clicked.connect(self.clean_backups)
+        backup_layout.addWidget(self.clean_btn)
         
         backup_layout.addStretch()
         backup_group.setLayout(backup_layout)
@@ -100,16 +101,16 @@ class BackupTab(QWidget):
         restore_layout.addWidget(self.backup_list)
         
         # Restore button
-        restore_btn = QPushButton("Restore Selected Backup")
-        restore_btn.setIcon(QIcon.fromTheme("edit-undo"))
-        restore_btn.clicked.connect(self.restore_selected_backup)
-        restore_layout.addWidget(restore_btn)
+        self.restore_btn = QPushButton("Restore Selected Backup")
+        self.restore_btn.setIcon(QIcon.fromTheme("edit-undo"))
+        self.restore_btn.clicked.connect(self.restore_selected_backup)
+        restore_layout.addWidget(self.restore_btn)
         
         # Refresh list button
-        refresh_btn = QPushButton("Refresh List")
-        refresh_btn.setIcon(QIcon.fromTheme("view-refresh"))
-        refresh_btn.clicked.connect(self.refresh_backup_list)
-        restore_layout.addWidget(refresh_btn)
+        self.refresh_btn = QPushButton("Refresh List")
+        self.refresh_btn.setIcon(QIcon.fromTheme("view-refresh"))
+        self.refresh_btn.clicked.connect(self.refresh_backup_list)
+        restore_layout.addWidget(self.refresh_btn)
         
         restore_group.setLayout(restore_layout)
         columns_layout.addWidget(restore_group)
@@ -175,6 +176,7 @@ class BackupTab(QWidget):
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(0)
             self.progress_bar.setRange(0, 0)  # Indeterminate progress
+            self._set_operations_enabled(False)
             
             # Schedule the backup operation to run after the UI updates
             QTimer.singleShot(100, self._execute_backup)
@@ -183,12 +185,29 @@ class BackupTab(QWidget):
             logger.error(f"Error preparing backup: {e}")
             logger.debug(traceback.format_exc())
             self.progress_bar.setVisible(False)
+            self._set_operations_enabled(True)
             QMessageBox.critical(self, "Error", f"An error occurred while preparing backup: {str(e)}")
     
+    def _set_operations_enabled(self, enabled):
+        """Enable or disable every action that touches the database or backup files"""
+        for widget in (self.backup_btn, self.export_btn, self.import_btn, self.clean_btn,
+                       self.restore_btn, self.refresh_btn, self.backup_list):
+            widget.setEnabled(enabled)
+    
+    def _update_copy_progress(self, status, remaining, total):
+        """Update the progress bar from a database copy progress callback"""
+        if total > 0:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(total - remaining)
+        
+        # Keep the UI responsive between copy steps; the backup actions are
+        # disabled for the duration, so this cannot start a nested copy
+        QApplication.processEvents()
+    
     def _execute_backup(self):
         """Execute the actual backup operation"""
         try:
-            backup_path = self.backup_manager.create_backup()
+            backup_path = self.backup_manager.create_backup(progress_callback=self._update_copy_progress)
             
             # Update progress
             self.progress_bar.setRange(0, 100)
@@ -210,6 +229,7 @@ class BackupTab(QWidget):
         finally:
             # Hide progress bar
             self.progress_bar.setVisible(False)
+            self._set_operations_enabled(True)
     
     def export_backup(self):
         """Export a backup to a user-specified location"""
@@ -316,6 +336,7 @@ class BackupTab(QWidget):
             # Show progress
             self.progress_bar.setVisible(True)
             self.progress_bar.setRange(0, 0)  # Indeterminate progress
+            self._set_operations_enabled(False)
 
             # Schedule the restore operation
             logger.info(f"Initiating restore from backup: {backup_path}")
@@ -325,13 +346,20 @@ class BackupTab(QWidget):
             logger.error(f"Error preparing for backup restore: {e}")
             logger.debug(traceback.format_exc())
             self.progress_bar.setVisible(False)
+            self._set_operations_enabled(True)
             QMessageBox.critical(self, "Error", f"An error occurred while preparing restore: {str(e)}")
     
     def _execute_restore(self, backup_path):
         """Execute the actual restore operation"""
         try:
-            # Perform restoration
-            success = self.backup_manager.restore_backup(backup_path)
+            # Perform restoration. Other tabs must not query the database while
+            # it is half restored, so the whole window is disabled for the copy.
+            self.window().setEnabled(False)
+            try:
+                success = self.backup_manager.restore_backup(backup_path,
+                                                              progress_callback=self._update_copy_progress)
+            finally:
+                self.window().setEnabled(True)
 
             # Update progress
             self.progress_bar.setRange(0, 100)
@@ -339,6 +367,8 @@ class BackupTab(QWidget):
 
             if success:
                 logger.info(f"Successfully restored database from backup: {backup_path}")
+                # Cached totals, forecasts and payoff plans predate the restore
+                self.budget_manager.db.invalidate_caches()
                 QMessageBox.information(self, "Restore Successful", 
                                       "Database has been successfully restored from the selected backup.\n\n" +
                                       "You may need to restart the application for all changes to take effect.")
@@ -353,6 +383,7 @@ class BackupTab(QWidget):
         finally:
             # Hide progress bar
             self.progress_bar.setVisible(False)
+            self._set_operations_enabled(True)
     
     def clean_backups(self):
         """Clean old backups, keeping only the most recent ones"""
@@ -382,6 +413,7 @@ class BackupTab(QWidget):
             # Show progress
             self.progress_bar.setVisible(True)
             self.progress_bar.setRange(0, 0)  # Indeterminate progress
+            self._set_operations_enabled(False)
 
             # Schedule the cleanup operation
             logger.info("Initiating backup cleanup")
@@ -391,6 +423,7 @@ class BackupTab(QWidget):
             logger.error(f"Error preparing for backup cleanup: {e}")
             logger.debug(traceback.format_exc())
             self.progress_bar.setVisible(False)
+            self._set_operations_enabled(True)
             QMessageBox.critical(self, "Error", f"An error occurred while preparing cleanup: {str(e)}")
     
     def _execute_cleanup(self):
@@ -417,3 +450,4 @@ class BackupTab(QWidget):
         finally:
             # Hide progress bar
             self.progress_bar.setVisible(False)
+            self._set_operations_enabled(True)